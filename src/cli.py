@@ -0,0 +1,364 @@
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+from src.config import INTERVALS, RunConfig, load_config
+
+# pandas, numpy and everything under src that depends on them are imported
+# inside the commands, so that --help and config validation start fast
+
+
+def _random_state() -> dict:
+    import random
+
+    import numpy as np
+
+    name, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    return {
+        "random": random.getstate(),
+        "numpy": [name, keys.tolist(), position, has_gauss, cached_gaussian],
+    }
+
+
+def _restore_random_state(state: dict) -> None:
+    import random
+
+    import numpy as np
+
+    version, internal_state, gauss_next = state["random"]
+    random.setstate((version, tuple(internal_state), gauss_next))
+    name, keys, position, has_gauss, cached_gaussian = state["numpy"]
+    np.random.set_state(
+        (name, np.array(keys, dtype=np.uint32), position, has_gauss, cached_gaussian)
+    )
+
+
+def _save_checkpoint(
+    path: str, config: RunConfig, generation: int, agents, run_id: str
+) -> None:
+    checkpoint = {
+        "run_id": run_id,
+        "config": config.to_dict(),
+        "generation": generation,
+        "strategies": [agent.strategy.to_dict() for agent in agents],
+        # a resumed run continues the mutations instead of replaying them
+        "random_state": _random_state(),
+    }
+    # replace the checkpoint at once, an interrupted write leaves the old one
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(checkpoint, file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def _run_system(
+    config: RunConfig,
+    first_generation: int,
+    strategies: list[dict] | None,
+    checkpoint: str | None,
+    results: str | None,
+    run_id: str,
+    random_state: dict | None = None,
+) -> None:
+    import pandas as pd
+
+    from src.exchange import LocalBTCExchange
+    from src.results import ResultsSink
+    from src.strategy import ExponentialDecayOHLCVStrategy
+    from src.system import create_system
+
+    system = create_system(config, LocalBTCExchange(config.data_path))
+    if strategies is not None:
+        system.agents = [
+            system.create_agent(
+                f"agent_{i}", ExponentialDecayOHLCVStrategy.from_dict(strategy)
+            )
+            for i, strategy in enumerate(strategies)
+        ]
+    if random_state is not None:
+        _restore_random_state(random_state)
+
+    sink = ResultsSink(results, run_id) if results is not None else None
+    on_generation = None
+    if sink is not None:
+
+        def on_generation(generation: int) -> None:
+            sink.record_generation(generation, system.agents)
+
+    start_time = pd.Timestamp(config.start_time)
+    try:
+        for generation in range(first_generation, config.generations):
+            system.run(
+                start_time, 1, first_generation=generation, on_generation=on_generation
+            )
+            if checkpoint is not None:
+                _save_checkpoint(
+                    checkpoint, config, generation + 1, system.agents, run_id
+                )
+            print(f"generation {generation + 1}/{config.generations} done")
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+def run(args: argparse.Namespace) -> int:
+    config = load_config(args.config)
+    if args.check:
+        print(f"{args.config} is valid")
+        return 0
+
+    run_id = args.run_id or uuid.uuid4().hex
+    _run_system(config, 0, None, args.checkpoint, args.results, run_id)
+    return 0
+
+
+def resume(args: argparse.Namespace) -> int:
+    with open(args.checkpoint) as file:
+        checkpoint = json.load(file)
+
+    config = RunConfig.from_dict(checkpoint["config"])
+    _run_system(
+        config,
+        checkpoint["generation"],
+        checkpoint["strategies"],
+        args.checkpoint,
+        args.results,
+        checkpoint.get("run_id") or uuid.uuid4().hex,
+        checkpoint.get("random_state"),
+    )
+    return 0
+
+
+def sweep(args: argparse.Namespace) -> int:
+    config = load_config(args.config)
+    with open(args.space) as file:
+        space = json.load(file)
+
+    from src.sweep import SweepRunner, grid_search, random_search
+
+    if args.samples is None:
+        trials = grid_search(space)
+    else:
+        trials = random_search(space, args.samples, args.seed)
+
+    runner = SweepRunner(config, trials, args.output, max_workers=args.workers)
+    print(f"{len(runner.pending_trials())} of {len(trials)} trials pending")
+    results = runner.run()
+    print(results.sort_values("best_fitness", ascending=False).head(10).to_string())
+    return 0
+
+
+def best(args: argparse.Namespace) -> int:
+    from src.results import ResultsStore
+
+    store = ResultsStore(args.results)
+    try:
+        print(json.dumps(store.best_genomes(args.limit, args.run_id), indent=2))
+    finally:
+        store.close()
+    return 0
+
+
+def backtest(args: argparse.Namespace) -> int:
+    import pandas as pd
+
+    from src.exchange import INTERVAL_TIMEDELTAS, Interval, LocalBTCExchange
+    from src.strategy import ExponentialDecayOHLCVStrategy
+    from src.trading_agent import TradingAgent
+
+    with open(args.genome) as file:
+        strategy = ExponentialDecayOHLCVStrategy.from_dict(json.load(file))
+
+    interval = Interval(args.interval)
+    agent = TradingAgent(
+        name="backtest",
+        exchange=LocalBTCExchange(args.data),
+        strategy=strategy,
+        initial_capital=args.capital,
+    )
+
+    now = pd.Timestamp(args.start)
+    for _ in range(args.ticks):
+        now += INTERVAL_TIMEDELTAS[interval]
+        agent.update(now, strategy.window_size, interval)
+
+    print(
+        json.dumps(
+            {
+                "capital": float(agent.capital),
+                "position": float(agent.position),
+                "max_drawdown": agent.calculate_max_drawdown(),
+                "fitness": agent.fitness(),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+def benchmark(args: argparse.Namespace) -> int:
+    import pandas as pd
+
+    from src.exchange import INTERVAL_TIMEDELTAS, Interval, LocalBTCExchange, Precision
+    from src.precision import compare_decisions
+    from src.system import TradingSystem
+
+    started = time.perf_counter()
+    exchange = LocalBTCExchange(args.data, precision=Precision(args.precision))
+    loaded = time.perf_counter()
+
+    interval = Interval(args.interval)
+    system = TradingSystem(
+        exchange=exchange,
+        initial_population=args.agents,
+        generation_lifespan=args.ticks,
+        interval=interval,
+    )
+    start_time = pd.Timestamp(args.start)
+    system.evaluate(start_time)
+    evaluated = time.perf_counter()
+
+    decisions = args.agents * args.ticks
+    print(f"load: {loaded - started:.3f}s")
+    print(f"memory: {exchange.memory_usage() / 2**20:.1f}MiB ({args.precision})")
+    print(
+        f"evaluate: {evaluated - loaded:.3f}s for {decisions} decisions "
+        f"({(evaluated - loaded) / decisions * 1e6:.1f}us per decision)"
+    )
+
+    if exchange.precision != Precision.FLOAT64:
+        report = compare_decisions(
+            LocalBTCExchange(args.data),
+            exchange,
+            [agent.strategy for agent in system.agents],
+            [
+                start_time + INTERVAL_TIMEDELTAS[interval] * (step + 1)
+                for step in range(args.ticks)
+            ],
+        )
+        print(
+            f"accuracy vs float64: {report.action_agreement:.2%} same actions, "
+            f"confidence error max {report.max_confidence_error:.2e} "
+            f"mean {report.mean_confidence_error:.2e}"
+        )
+    return 0
+
+
+def convert_data(args: argparse.Namespace) -> int:
+    from src.exchange import Interval, LocalBTCExchange
+
+    exchange = LocalBTCExchange(args.source)
+    if args.interval is not None:
+        exchange = exchange.resample(Interval(args.interval))
+
+    market_data = exchange.market_data
+    if args.destination.endswith(".pkl"):
+        market_data.to_pickle(args.destination)
+    elif args.destination.endswith(".csv"):
+        market_data.to_csv(args.destination, index=False)
+    else:
+        raise ValueError("Destination must be a .csv or .pkl file")
+
+    print(f"wrote {len(market_data)} rows to {args.destination}")
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="swarm-mode", description="Evolve a swarm of trading agents."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run a trading system from a config")
+    run_parser.add_argument("config", help="json run configuration")
+    run_parser.add_argument("--checkpoint", help="write a checkpoint every generation")
+    run_parser.add_argument(
+        "--results", help="append generation results to a sqlite file"
+    )
+    run_parser.add_argument("--run-id", help="the run id of the results")
+    run_parser.add_argument(
+        "--check", action="store_true", help="only validate the configuration"
+    )
+    run_parser.set_defaults(handler=run)
+
+    resume_parser = commands.add_parser("resume", help="resume a run from a checkpoint")
+    resume_parser.add_argument("checkpoint", help="checkpoint written by run")
+    resume_parser.add_argument(
+        "--results", help="append generation results to a sqlite file"
+    )
+    resume_parser.set_defaults(handler=resume)
+
+    sweep_parser = commands.add_parser(
+        "sweep", help="run many configurations in a process pool"
+    )
+    sweep_parser.add_argument("config", help="json run configuration of every trial")
+    sweep_parser.add_argument(
+        "space",
+        help="json search space, a list of values per parameter, or low and high",
+    )
+    sweep_parser.add_argument("output", help="csv results table, resumed if it exists")
+    sweep_parser.add_argument(
+        "--samples", type=int, help="random search samples instead of the full grid"
+    )
+    sweep_parser.add_argument("--seed", type=int, default=0, help="the sampling seed")
+    sweep_parser.add_argument("--workers", type=int, help="defaults to the cpu count")
+    sweep_parser.set_defaults(handler=sweep)
+
+    best_parser = commands.add_parser("best", help="show the best stored genomes")
+    best_parser.add_argument("results", help="sqlite file written by run --results")
+    best_parser.add_argument("--limit", type=int, default=10)
+    best_parser.add_argument("--run-id", help="only consider this run")
+    best_parser.set_defaults(handler=best)
+
+    backtest_parser = commands.add_parser("backtest", help="backtest a single genome")
+    backtest_parser.add_argument("genome", help="json genome, as in a checkpoint")
+    backtest_parser.add_argument("--data", required=True, help="csv market data")
+    backtest_parser.add_argument("--start", default="2021-01-01 00:00:00")
+    backtest_parser.add_argument("--ticks", type=int, default=500)
+    backtest_parser.add_argument("--interval", choices=INTERVALS, default="hour")
+    backtest_parser.add_argument("--capital", type=float, default=1000)
+    backtest_parser.set_defaults(handler=backtest)
+
+    benchmark_parser = commands.add_parser(
+        "benchmark", help="time the evaluation of a random population"
+    )
+    benchmark_parser.add_argument("--data", required=True, help="csv market data")
+    benchmark_parser.add_argument("--start", default="2021-01-01 00:00:00")
+    benchmark_parser.add_argument("--agents", type=int, default=20)
+    benchmark_parser.add_argument("--ticks", type=int, default=52)
+    benchmark_parser.add_argument("--interval", choices=INTERVALS, default="hour")
+    benchmark_parser.add_argument(
+        "--precision",
+        choices=("float64", "float32", "fixed"),
+        default="float64",
+        help="how the market data is stored, compact ones are checked for accuracy",
+    )
+    benchmark_parser.set_defaults(handler=benchmark)
+
+    convert_parser = commands.add_parser(
+        "convert-data", help="convert or resample a market data csv"
+    )
+    convert_parser.add_argument("source", help="csv market data")
+    convert_parser.add_argument("destination", help=".csv or .pkl file")
+    convert_parser.add_argument(
+        "--interval", choices=INTERVALS, help="resample the candles to this interval"
+    )
+    convert_parser.set_defaults(handler=convert_data)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as error:
+        print(f"swarm-mode {args.command}: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
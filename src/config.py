@@ -0,0 +1,93 @@
+import json
+from dataclasses import asdict, dataclass, fields
+
+# this module is imported by the command line before anything heavy, keep it on
+# the standard library only
+INTERVALS = ("minute", "hour", "day")
+
+
+@dataclass
+class RunConfig:
+    """
+    The configuration of a trading system run.
+
+    Args:
+        data_path (str): the csv file with the market data.
+        initial_population (int): the number of agents per generation.
+        generation_lifespan (int): the number of ticks every generation trades.
+        generations (int): the number of generations to run.
+        interval (str): the candle interval, one of minute, hour or day.
+        mutation_rate (float): the standard deviation of the genome mutations.
+        start_time (str): the time the first generation starts trading from.
+        position_size_percent (float): the share of capital an agent trades at once.
+        transaction_fee (float): the fee per traded value.
+        seed (int): seeds the random genomes and mutations, random if not set.
+    """
+
+    data_path: str
+    initial_population: int = 20
+    generation_lifespan: int = 52
+    generations: int = 100
+    interval: str = "hour"
+    mutation_rate: float = 0.05
+    start_time: str = "2021-01-01 00:00:00"
+    position_size_percent: float = 0.1
+    transaction_fee: float = 0.0001
+    seed: int | None = None
+
+    def __post_init__(self):
+        for name in ("initial_population", "generation_lifespan", "generations"):
+            value = getattr(self, name)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f"{name} must be a positive integer")
+
+        if self.interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {', '.join(INTERVALS)}")
+
+        for name in ("mutation_rate", "position_size_percent", "transaction_fee"):
+            value = getattr(self, name)
+            if not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{name} must be a non-negative number")
+
+        if self.seed is not None and not isinstance(self.seed, int):
+            raise ValueError("seed must be an integer")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunConfig":
+        """
+        Create a configuration from a dictionary, rejecting unknown keys.
+
+        Args:
+            data (dict): the configuration values.
+
+        Returns: the configuration.
+        """
+        known = {field.name for field in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown configuration keys: {', '.join(unknown)}")
+        if "data_path" not in data:
+            raise ValueError("data_path is required")
+
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the configuration to a dictionary.
+
+        Returns: a dictionary containing the configuration.
+        """
+        return asdict(self)
+
+
+def load_config(path: str) -> RunConfig:
+    """
+    Load and validate a json configuration file.
+
+    Args:
+        path (str): the path of the configuration file.
+
+    Returns: the configuration.
+    """
+    with open(path) as file:
+        return RunConfig.from_dict(json.load(file))
@@ -0,0 +1,447 @@
+"""
+Differential testing of optimized engines against a frozen reference engine.
+
+The reference engine below is a deliberately plain copy of the semantics the
+optimized paths have to keep, quirks included: the bfill of the inter-candle norm,
+the 1e-6 substitution of zero candle ranges, the signed confidence scaling of the
+trade quantity and the drawdown over every decision, traded or not. Do not
+optimize it.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.exchange import Exchange, LocalBTCExchange
+from src.strategy import ExponentialDecayOHLCVStrategy, TradeAction, TradingStrategy
+from src.trading_agent import TradingAgent
+
+EDGE_CASES = (
+    "flat_candles",
+    "zero_range_candles",
+    "gaps",
+    "constant_close",
+    "tiny_prices",
+    "huge_prices",
+    "zero_volume",
+)
+
+
+def random_ohlcv_frame(
+    rng: np.random.Generator, rows: int, edge_case: str | None = None
+) -> pd.DataFrame:
+    """
+    Generate an hourly OHLCV frame from a random walk, optionally with an edge case.
+
+    Args:
+        rng (np.random.Generator): the random generator.
+        rows (int): the number of candles.
+        edge_case (str): one of EDGE_CASES.
+
+    Returns: the frame.
+    """
+    base = 100.0
+    if edge_case == "tiny_prices":
+        base = 1e-4
+    elif edge_case == "huge_prices":
+        base = 1e6
+
+    close = base * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate([[base], close[:-1]])
+    spread = base * rng.uniform(0, 0.01, rows)
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.uniform(1, 100, rows)
+
+    if edge_case == "flat_candles":
+        open_ = high = low = close = np.full(rows, base)
+    elif edge_case == "zero_range_candles":
+        flat = rng.random(rows) < 0.3
+        open_, high, low = (
+            np.where(flat, close, open_),
+            np.where(flat, close, high),
+            np.where(flat, close, low),
+        )
+    elif edge_case == "gaps":
+        # the high touches the previous low, so the inter-candle range is zero
+        gap = np.concatenate([[False], rng.random(rows - 1) < 0.3])
+        high = np.where(gap, np.concatenate([[0.0], low[:-1]]), high)
+        low = np.minimum(low, high)
+        open_ = np.clip(open_, low, high)
+        close = np.clip(close, low, high)
+    elif edge_case == "constant_close":
+        close = np.full(rows, base)
+        open_ = np.full(rows, base)
+    elif edge_case == "zero_volume":
+        volume = np.where(rng.random(rows) < 0.5, 0.0, volume)
+
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2021-01-01", periods=rows, freq="h"),
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": volume,
+        }
+    )
+
+
+def random_genome(rng: np.random.Generator) -> dict:
+    """
+    Generate a random ExponentialDecayOHLCVStrategy genome.
+
+    Args:
+        rng (np.random.Generator): the random generator.
+
+    Returns: the genome, as returned by to_dict.
+    """
+    return {
+        "type": "exponential_decay_ohlcv",
+        "coeffs": [float(rng.uniform(-1, 1)), float(rng.uniform(-1, 1))],
+        "gamma": float(rng.uniform(0, 1)),
+        "threshold": float(rng.uniform(0, 0.5)),
+        "window_size": int(rng.integers(1, 60)),
+    }
+
+
+def reference_intra_norm(market_data: pd.DataFrame) -> float:
+    ranges = (market_data["High"] - market_data["Low"]).replace(0, 1e-6)
+    return ((market_data["Close"] - market_data["Open"]) / ranges).mean()
+
+
+def reference_inter_norm(market_data: pd.DataFrame) -> float:
+    prev_close = market_data["Close"].shift(1)
+    prev_low = market_data["Low"].shift(1)
+    changes = (market_data["Close"] - prev_close.bfill()) / (
+        market_data["High"] - prev_low
+    )
+    return changes.bfill().mean()
+
+
+class ReferenceStrategy:
+    def __init__(self, genome: dict):
+        self.coeffs = list(genome["coeffs"])
+        self.gamma = genome["gamma"]
+        self.threshold = genome["threshold"]
+        self.window_size = genome["window_size"]
+
+    def decide(self, market_data: pd.DataFrame) -> tuple[TradeAction, float, dict]:
+        window_size = min(self.window_size, len(market_data))
+        market_data = market_data.tail(window_size)
+        decay_weights = np.exp(-self.gamma * np.arange(window_size)[::-1])
+
+        norm = self.coeffs[0] * reference_inter_norm(market_data)
+        norm += self.coeffs[1] * reference_intra_norm(market_data)
+        score = (
+            norm * decay_weights * market_data["Volume"] / market_data["Volume"].mean()
+        )
+        confidence = np.clip(score.sum(), -1, 1)
+
+        if confidence > self.threshold:
+            return TradeAction.LONG, confidence, {}
+        if confidence < -self.threshold:
+            return TradeAction.SHORT, confidence, {}
+        return TradeAction.HOLD, confidence, {}
+
+
+class ReferenceExchange:
+    def __init__(self, market_data: pd.DataFrame):
+        self.market_data = market_data.copy()
+        self.market_data["timestamp"] = pd.to_datetime(self.market_data["timestamp"])
+
+    def get_market_data(self, now, max_history_count: int, interval=None):
+        return self.market_data[self.market_data["timestamp"] <= now].tail(
+            max_history_count
+        )
+
+    def get_current_price(self, now) -> float:
+        return self.market_data[self.market_data["timestamp"] == now].iloc[0]["Close"]
+
+    def execute_trade(self, trade: dict) -> None:
+        pass
+
+
+class ReferenceAgent:
+    def __init__(
+        self,
+        exchange: Exchange,
+        strategy: TradingStrategy,
+        initial_capital: float,
+        position_size_percent: float,
+        min_trade_size: float,
+        transaction_fee: float,
+    ):
+        self.exchange = exchange
+        self.strategy = strategy
+        self.initial_capital = self.capital = initial_capital
+        self.max_position_value = initial_capital * position_size_percent
+        self.min_trade_size = min_trade_size
+        self.transaction_fee = transaction_fee
+        self.position = 0
+        self.decisions = []
+
+    def update(self, now, max_history_count: int, interval=None) -> None:
+        market_data = self.exchange.get_market_data(now, max_history_count, interval)
+        price = self.exchange.get_current_price(now)
+        signal, confidence, _ = self.strategy.decide(market_data)
+
+        direction = 1 if signal == "long" else -1 if signal == "short" else 0
+        quantity = self.max_position_value / price * confidence * direction
+        if abs(quantity) * price > self.min_trade_size:
+            self.capital -= quantity * price + quantity * price * self.transaction_fee
+            self.position += quantity
+
+        self.decisions.append({"timestamp": now, "price": price, "quantity": quantity})
+
+    def calculate_max_drawdown(self) -> float:
+        values = []
+        position = 0
+        capital = self.initial_capital
+        for decision in sorted(self.decisions, key=lambda x: x["timestamp"]):
+            position += decision["quantity"]
+            capital -= decision["price"] * decision["quantity"]
+            values.append(capital + position * decision["price"])
+
+        if len(values) < 2:
+            return 0.0
+
+        running_max = float("-inf")
+        max_drawdown = 0.0
+        for value in values:
+            running_max = max(running_max, value)
+            drawdown = (running_max - value) / running_max if running_max > 0 else 0
+            max_drawdown = max(max_drawdown, drawdown)
+        return float(max_drawdown)
+
+    def fitness(self) -> float:
+        if not self.decisions:
+            return 0.0
+        value = self.capital + self.position * self.decisions[-1]["price"]
+        return max(
+            0.0, value / self.initial_capital * (1 - self.calculate_max_drawdown())
+        )
+
+
+@dataclass
+class Engine:
+    """
+    A way to build the exchange, strategy and agent of a simulation.
+
+    Args:
+        name (str): the name of the engine.
+        exchange (Callable[[pd.DataFrame], Exchange]): creates the exchange.
+        strategy (Callable[[dict], TradingStrategy]): creates a strategy from a genome.
+        agent (Callable[..., TradingAgent]): creates the agent, with the keyword
+            arguments exchange, strategy, initial_capital, position_size_percent,
+            min_trade_size and transaction_fee.
+    """
+
+    name: str
+    exchange: Callable[[pd.DataFrame], Exchange]
+    strategy: Callable[[dict], TradingStrategy]
+    agent: Callable[..., TradingAgent]
+
+
+REFERENCE_ENGINE = Engine(
+    "reference", ReferenceExchange, ReferenceStrategy, ReferenceAgent
+)
+
+CURRENT_ENGINE = Engine(
+    "current",
+    LocalBTCExchange.from_frame,
+    ExponentialDecayOHLCVStrategy.from_dict,
+    lambda **kwargs: TradingAgent(name="differential", **kwargs),
+)
+
+
+@dataclass
+class Trace:
+    """
+    What an engine did over one simulation.
+
+    Args:
+        actions (list[str]): the action of every tick.
+        confidences (list[float]): the confidence of every tick.
+        quantities (list[float]): the quantity of every tick.
+        capital (float): the final capital.
+        position (float): the final position.
+        max_drawdown (float): the maximum drawdown.
+        fitness (float): the fitness.
+    """
+
+    actions: list[str] = field(default_factory=list)
+    confidences: list[float] = field(default_factory=list)
+    quantities: list[float] = field(default_factory=list)
+    capital: float = 0.0
+    position: float = 0.0
+    max_drawdown: float = 0.0
+    fitness: float = 0.0
+
+
+class _RecordingStrategy:
+    # records the decisions of the engine's strategy on their way to the agent
+    def __init__(self, strategy: TradingStrategy, trace: "Trace"):
+        self.strategy = strategy
+        self.trace = trace
+
+    def decide(self, market_data: pd.DataFrame) -> tuple[TradeAction, float, dict]:
+        action, confidence, data = self.strategy.decide(market_data)
+        self.trace.actions.append(str(TradeAction(action).value))
+        self.trace.confidences.append(float(confidence))
+        return action, confidence, data
+
+
+def run_engine(
+    engine: Engine,
+    market_data: pd.DataFrame,
+    genome: dict,
+    ticks: int | None = None,
+    max_history_count: int = 100,
+) -> Trace:
+    """
+    Let one agent trade the genome over the market data.
+
+    Args:
+        engine (Engine): the engine.
+        market_data (pd.DataFrame): the OHLCV frame.
+        genome (dict): the genome of the strategy.
+        ticks (int): the number of ticks, from the end of the frame, defaults to all.
+        max_history_count (int): the number of candles every decision sees.
+
+    Returns: the trace of the simulation.
+    """
+    trace = Trace()
+    exchange = engine.exchange(market_data)
+    strategy = _RecordingStrategy(engine.strategy(genome), trace)
+    agent = engine.agent(
+        exchange=exchange,
+        strategy=strategy,
+        initial_capital=1000,
+        position_size_percent=0.5,
+        min_trade_size=1,
+        transaction_fee=0.001,
+    )
+
+    timestamps = pd.to_datetime(market_data["timestamp"])
+    for now in timestamps.iloc[-(ticks or len(timestamps)) :]:
+        agent.update(now, max_history_count, None)
+        trace.quantities.append(float(agent.decisions[-1]["quantity"]))
+
+    trace.capital = float(agent.capital)
+    trace.position = float(agent.position)
+    trace.max_drawdown = float(agent.calculate_max_drawdown())
+    trace.fitness = float(agent.fitness())
+    return trace
+
+
+def _close(reference: float, candidate: float, rtol: float, atol: float) -> bool:
+    if np.isnan(reference) or np.isnan(candidate):
+        return bool(np.isnan(reference) and np.isnan(candidate))
+    return bool(np.isclose(candidate, reference, rtol=rtol, atol=atol))
+
+
+def compare_traces(
+    reference: Trace,
+    candidate: Trace,
+    threshold: float,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> list[str]:
+    """
+    Compare two traces of the same simulation.
+
+    An action may only differ when the reference confidence is within tolerance of
+    the threshold, and then the rest of the simulation and the P&L are not compared,
+    as they legitimately diverge.
+
+    Args:
+        reference (Trace): the reference trace.
+        candidate (Trace): the candidate trace.
+        threshold (float): the threshold of the genome.
+        rtol (float): the relative tolerance.
+        atol (float): the absolute tolerance.
+
+    Returns: a description of every mismatch, empty if the traces match.
+    """
+    mismatches = []
+    for tick, (reference_action, candidate_action) in enumerate(
+        zip(reference.actions, candidate.actions)
+    ):
+        reference_confidence = reference.confidences[tick]
+        candidate_confidence = candidate.confidences[tick]
+
+        if not _close(reference_confidence, candidate_confidence, rtol, atol):
+            mismatches.append(
+                f"tick {tick}: confidence {candidate_confidence!r} != "
+                f"{reference_confidence!r}"
+            )
+        if reference_action != candidate_action:
+            near_threshold = _close(abs(reference_confidence), threshold, rtol, atol)
+            if near_threshold:
+                return mismatches
+            mismatches.append(
+                f"tick {tick}: action {candidate_action} != {reference_action}"
+            )
+        if not _close(
+            reference.quantities[tick], candidate.quantities[tick], rtol, atol
+        ):
+            mismatches.append(
+                f"tick {tick}: quantity {candidate.quantities[tick]!r} != "
+                f"{reference.quantities[tick]!r}"
+            )
+
+    if len(reference.actions) != len(candidate.actions):
+        mismatches.append(f"ticks {len(candidate.actions)} != {len(reference.actions)}")
+
+    for name in ("capital", "position", "max_drawdown", "fitness"):
+        reference_value = getattr(reference, name)
+        candidate_value = getattr(candidate, name)
+        if not _close(reference_value, candidate_value, rtol, atol):
+            mismatches.append(f"{name} {candidate_value!r} != {reference_value!r}")
+
+    return mismatches
+
+
+def assert_engines_match(
+    candidate: Engine,
+    frames: list[pd.DataFrame],
+    genomes: list[dict],
+    reference: Engine = REFERENCE_ENGINE,
+    ticks: int | None = None,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> None:
+    """
+    Run every genome on every frame with both engines and assert the decisions and
+    the P&L match within tolerance.
+
+    Args:
+        candidate (Engine): the engine under test.
+        frames (list[pd.DataFrame]): the OHLCV frames.
+        genomes (list[dict]): the genomes.
+        reference (Engine): the engine defining the expected behaviour.
+        ticks (int): the number of ticks per simulation, defaults to every candle.
+        rtol (float): the relative tolerance.
+        atol (float): the absolute tolerance.
+    """
+    failures = []
+    for frame_index, frame in enumerate(frames):
+        for genome in genomes:
+            mismatches = compare_traces(
+                run_engine(reference, frame, genome, ticks),
+                run_engine(candidate, frame, genome, ticks),
+                genome["threshold"],
+                rtol,
+                atol,
+            )
+            if mismatches:
+                failures.append(
+                    f"{candidate.name} vs {reference.name}, frame {frame_index}, "
+                    f"genome {genome}:\n  " + "\n  ".join(mismatches[:5])
+                )
+
+    if failures:
+        raise AssertionError("\n".join(failures))
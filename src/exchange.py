@@ -2,6 +2,7 @@ import datetime
 from enum import Enum
 from typing import Protocol
 
+import numpy as np
 import pandas as pd
 
 
@@ -11,6 +12,50 @@ class Interval(str, Enum):
     DAY = "day"
 
 
+INTERVAL_TIMEDELTAS = {
+    Interval.MINUTE: datetime.timedelta(minutes=1),
+    Interval.HOUR: datetime.timedelta(hours=1),
+    Interval.DAY: datetime.timedelta(days=1),
+}
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+OHLCV_COLUMNS = PRICE_COLUMNS + ["Volume"]
+
+
+class Precision(str, Enum):
+    FLOAT64 = "float64"
+    FLOAT32 = "float32"
+    FIXED = "fixed"
+
+
+INTERVAL_RULES = {
+    Interval.MINUTE: "min",
+    Interval.HOUR: "h",
+    Interval.DAY: "D",
+}
+
+
+def fixed_point_scale(prices: np.ndarray, max_decimals: int = 8) -> int:
+    """
+    Get the largest power of ten that keeps the scaled prices within int32.
+
+    Args:
+        prices (np.ndarray): the prices to scale.
+        max_decimals (int): the maximum number of decimals to keep.
+
+    Returns: the scale.
+    """
+    max_price = float(np.nanmax(np.abs(prices))) if prices.size else 0.0
+    decimals = max_decimals
+    while decimals > 0 and max_price * 10**decimals > np.iinfo(np.int32).max:
+        decimals -= 1
+    return 10**decimals
+
+
+def _to_datetime64(now: datetime) -> np.datetime64:
+    return pd.Timestamp(now).to_datetime64()
+
+
 class Exchange(Protocol):
     def get_market_data(
         self, now: datetime, max_history_count: int, interval: Interval
@@ -49,20 +94,193 @@ class Exchange(Protocol):
 
 
 class LocalBTCExchange:
-    def __init__(self, path: str):
+    """
+    An exchange replaying market data from a csv file.
+
+    Args:
+        path (str): the csv file with a timestamp column and OHLCV columns.
+        precision (Precision): how the OHLCV columns are stored. float32 halves the
+            memory of the default float64, fixed stores the prices as int32 in units
+            of 1 / price_scale and the volume as float32.
+    """
+
+    def __init__(self, path: str, precision: Precision = Precision.FLOAT64):
         # read market data from a file in data folder as pandas dataframe
-        self.market_data = pd.read_csv(path)
-        self.market_data["timestamp"] = pd.to_datetime(self.market_data["timestamp"])
+        market_data = pd.read_csv(path)
+        market_data["timestamp"] = pd.to_datetime(market_data["timestamp"])
+        self._set_market_data(market_data, Precision(precision))
+
+    @classmethod
+    def from_frame(
+        cls,
+        market_data: pd.DataFrame,
+        precision: Precision = Precision.FLOAT64,
+        copy: bool = True,
+    ) -> "LocalBTCExchange":
+        """
+        Create an exchange over an already loaded market data frame.
+
+        Args:
+            market_data (pd.DataFrame): OHLCV rows with a timestamp column.
+            precision (Precision): how the OHLCV columns are stored.
+            copy (bool): whether to copy the frame. Without a copy, a float64 frame
+                sorted by timestamp is used as is, e.g. over shared memory.
+
+        Returns: the exchange.
+        """
+        exchange = cls.__new__(cls)
+        exchange._set_market_data(
+            market_data.copy() if copy else market_data, Precision(precision)
+        )
+        return exchange
+
+    def _set_market_data(
+        self,
+        market_data: pd.DataFrame,
+        precision: Precision,
+        price_scale: int | None = None,
+    ) -> None:
+        # lookups binary search the timestamps, so the rows must be in order
+        if not market_data["timestamp"].is_monotonic_increasing:
+            market_data = market_data.sort_values("timestamp", kind="stable")
+        if not market_data.index.equals(pd.RangeIndex(len(market_data))):
+            market_data = market_data.reset_index(drop=True)
+
+        self.precision = precision
+        self.price_scale = 1
+        if precision == Precision.FLOAT32:
+            market_data[OHLCV_COLUMNS] = market_data[OHLCV_COLUMNS].astype(np.float32)
+        elif precision == Precision.FIXED:
+            prices = market_data[PRICE_COLUMNS].to_numpy(dtype=np.float64)
+            self.price_scale = price_scale or fixed_point_scale(prices)
+            market_data[PRICE_COLUMNS] = np.round(prices * self.price_scale).astype(
+                np.int32
+            )
+            market_data["Volume"] = market_data["Volume"].astype(np.float32)
+
+        self.market_data = market_data
+        self._timestamps = market_data["timestamp"].to_numpy()
+        self._ohlcv = None
+
+    def _derive(self, market_data: pd.DataFrame) -> "LocalBTCExchange":
+        # a new exchange over rows derived from this exchange's stored columns
+        exchange = LocalBTCExchange.__new__(LocalBTCExchange)
+        exchange.precision = self.precision
+        exchange.price_scale = self.price_scale
+        exchange.market_data = market_data.astype(
+            self.market_data.dtypes[market_data.columns]
+        ).reset_index(drop=True)
+        exchange._timestamps = exchange.market_data["timestamp"].to_numpy()
+        exchange._ohlcv = None
+        return exchange
+
+    def memory_usage(self) -> int:
+        """
+        Get the memory used by the market data.
+
+        Returns: the number of bytes.
+        """
+        return int(self.market_data.memory_usage(deep=True).sum())
+
+    def resample(self, interval: Interval) -> "LocalBTCExchange":
+        """
+        Aggregate the market data into coarser candles.
+
+        Args:
+            interval (Interval): the interval of the new candles.
+
+        Returns: a new exchange over the resampled candles.
+        """
+        resampled = (
+            self.market_data.set_index("timestamp")
+            .resample(INTERVAL_RULES[interval])
+            .agg(
+                {
+                    "Open": "first",
+                    "High": "max",
+                    "Low": "min",
+                    "Close": "last",
+                    "Volume": "sum",
+                }
+            )
+            .dropna(subset=["Close"])
+            .reset_index()
+        )
+        return self._derive(resampled)
+
+    def subsample(self, step: int) -> "LocalBTCExchange":
+        """
+        Keep every step-th candle of the market data.
+
+        Args:
+            step (int): the number of candles between two kept candles.
+
+        Returns: a new exchange over the kept candles.
+        """
+        return self._derive(self.market_data.iloc[::step])
 
     def get_market_data(
         self, now: datetime, max_history_count: int, interval: Interval = Interval.HOUR
     ) -> pd.DataFrame:
-        return self.market_data[self.market_data["timestamp"] <= now].tail(
-            max_history_count
+        # the rows up to now, sliced without scanning or copying the whole frame
+        end = np.searchsorted(self._timestamps, _to_datetime64(now), side="right")
+        return self.market_data.iloc[max(0, end - max_history_count) : end]
+
+    def get_market_windows(
+        self, start: datetime, end: datetime, window: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the history window of every candle from start to end as one strided
+        view, without copying a window.
+
+        Candles without window candles of history are left out. The OHLCV columns
+        are copied once into a contiguous array on the first call, prices of fixed
+        precision market data are in units of 1 / price_scale.
+
+        Args:
+            start (datetime): the time of the first candle.
+            end (datetime): the time of the last candle.
+            window (int): the number of candles per window, the candle included.
+
+        Returns: the timestamps of the candles and a read-only view of shape
+            (candles x window x OHLCV fields) over their windows.
+        """
+        if window < 1:
+            raise ValueError("Window must be positive")
+
+        if self._ohlcv is None:
+            self._ohlcv = np.ascontiguousarray(
+                self.market_data[OHLCV_COLUMNS].to_numpy()
+            )
+
+        if window > len(self._ohlcv):
+            # no candle has enough history
+            windows = np.empty((0, window, len(OHLCV_COLUMNS)), self._ohlcv.dtype)
+            windows.flags.writeable = False
+            return self._timestamps[:0], windows
+
+        first = np.searchsorted(self._timestamps, _to_datetime64(start), side="left")
+        last = np.searchsorted(self._timestamps, _to_datetime64(end), side="right")
+        first = max(first, window - 1)
+        last = max(last, first)
+
+        # window i of the view ends at candle i + window - 1
+        windows = np.lib.stride_tricks.sliding_window_view(
+            self._ohlcv, window, axis=0
+        ).transpose(0, 2, 1)
+
+        return (
+            self._timestamps[first:last],
+            windows[first - window + 1 : last - window + 1],
         )
 
     def get_current_price(self, now: datetime) -> float:
-        return self.market_data[self.market_data["timestamp"] == now].iloc[0]["Close"]
+        now = _to_datetime64(now)
+        index = np.searchsorted(self._timestamps, now, side="left")
+        if index == len(self._timestamps) or self._timestamps[index] != now:
+            raise IndexError(f"No market data at {now}")
+
+        return float(self.market_data["Close"].iat[index]) / self.price_scale
 
     def execute_trade(self, trade: dict) -> None:
         pass
@@ -0,0 +1,144 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.exchange import OHLCV_COLUMNS
+
+
+class FeatureStore:
+    """
+    The precomputed feature columns of an enriched market data csv, loaded once
+    into a contiguous float32 matrix with one row per candle, so that windows of
+    any feature can be read by position without recomputing indicators.
+
+    Args:
+        path (str): the enriched csv with a timestamp column.
+        columns (list[str]): the feature columns, defaults to every column besides
+            the timestamp and OHLCV.
+        cache_dir (str): a directory to keep the matrix in as .npy files. Later
+            stores over the same csv memory-map it instead of parsing the csv.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: list[str] | None = None,
+        cache_dir: str | None = None,
+    ):
+        metadata = {
+            "source": os.path.abspath(path),
+            "modified": os.path.getmtime(path),
+            "requested_columns": columns,
+        }
+
+        if cache_dir is not None and self._load_cache(cache_dir, metadata):
+            return
+
+        market_data = pd.read_csv(path)
+        market_data["timestamp"] = pd.to_datetime(market_data["timestamp"])
+        self._set_features(market_data, columns)
+
+        if cache_dir is not None:
+            self._save_cache(cache_dir, metadata)
+
+    @classmethod
+    def from_frame(
+        cls, market_data: pd.DataFrame, columns: list[str] | None = None
+    ) -> "FeatureStore":
+        """
+        Create a feature store over an already loaded market data frame.
+
+        Args:
+            market_data (pd.DataFrame): the rows with a timestamp column.
+            columns (list[str]): the feature columns.
+
+        Returns: the feature store.
+        """
+        store = cls.__new__(cls)
+        store._set_features(market_data, columns)
+        return store
+
+    def _set_features(
+        self, market_data: pd.DataFrame, columns: list[str] | None
+    ) -> None:
+        market_data = market_data.sort_values(
+            "timestamp", kind="stable", ignore_index=True
+        )
+        if columns is None:
+            columns = [
+                column
+                for column in market_data.columns
+                if column != "timestamp" and column not in OHLCV_COLUMNS
+            ]
+
+        self.columns = list(columns)
+        self.features = np.ascontiguousarray(
+            market_data[self.columns].to_numpy(dtype=np.float32)
+        )
+        self.timestamps = market_data["timestamp"].to_numpy()
+        self._column_indices = {column: i for i, column in enumerate(self.columns)}
+
+    def _load_cache(self, cache_dir: str, metadata: dict) -> bool:
+        try:
+            with open(os.path.join(cache_dir, "metadata.json")) as file:
+                cached = json.load(file)
+        except FileNotFoundError:
+            return False
+
+        if any(cached.get(key) != value for key, value in metadata.items()):
+            return False
+
+        self.columns = cached["columns"]
+        self.features = np.load(os.path.join(cache_dir, "features.npy"), mmap_mode="r")
+        self.timestamps = np.load(os.path.join(cache_dir, "timestamps.npy"))
+        self._column_indices = {column: i for i, column in enumerate(self.columns)}
+        return True
+
+    def _save_cache(self, cache_dir: str, metadata: dict) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(os.path.join(cache_dir, "features.npy"), self.features)
+        np.save(os.path.join(cache_dir, "timestamps.npy"), self.timestamps)
+        with open(os.path.join(cache_dir, "metadata.json"), "w") as file:
+            json.dump(dict(metadata, columns=self.columns), file)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def position(self, now) -> int:
+        """
+        Get the position of the last candle at or before now.
+
+        Args:
+            now (datetime): the time.
+
+        Returns: the position, or -1 if every candle is after now.
+        """
+        now = pd.Timestamp(now).to_datetime64()
+        return int(np.searchsorted(self.timestamps, now, side="right")) - 1
+
+    def window(self, position: int, size: int) -> np.ndarray:
+        """
+        Get the features of the size candles up to and including position.
+
+        Args:
+            position (int): the position of the last candle.
+            size (int): the maximum number of candles.
+
+        Returns: a (candles x features) view of the matrix.
+        """
+        return self.features[max(0, position + 1 - size) : position + 1]
+
+    def column_window(self, column: str, position: int, size: int) -> np.ndarray:
+        """
+        Get one feature of the size candles up to and including position.
+
+        Args:
+            column (str): the feature column.
+            position (int): the position of the last candle.
+            size (int): the maximum number of candles.
+
+        Returns: a view of the feature values.
+        """
+        return self.window(position, size)[:, self._column_indices[column]]
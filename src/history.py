@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+DECISION_DTYPE = np.dtype(
+    [("timestamp", "datetime64[ns]"), ("price", "f8"), ("quantity", "f8")]
+)
+
+
+class DecisionHistory:
+    """
+    A bounded-memory list of an agent's decisions. The last hot_size decisions are
+    kept in a ring buffer, older ones are spilled in segments to memory-mapped files
+    and only read back from disk when they are accessed.
+
+    Args:
+        hot_size (int): the number of decisions kept in memory.
+        spill_dir (str): the directory the spilled segments are written in, in a
+            subdirectory of their own that is removed with the history. Defaults to
+            the system's temporary directory.
+        segment_size (int): the number of decisions spilled at once, defaults to
+            hot_size.
+    """
+
+    def __init__(
+        self,
+        hot_size: int = 10_000,
+        spill_dir: str | None = None,
+        segment_size: int | None = None,
+    ):
+        if hot_size < 1:
+            raise ValueError("Hot size must be positive")
+
+        self.hot_size = hot_size
+        self.segment_size = min(segment_size or hot_size, hot_size)
+        self._hot = np.empty(hot_size, dtype=DECISION_DTYPE)
+        self._head = 0
+        self._hot_count = 0
+        self._segments: list[tuple[str, int]] = []
+        self._spilled_count = 0
+        self._spill_root = spill_dir
+        # created on the first spill, most histories never spill
+        self.spill_dir: str | None = None
+
+    def __len__(self) -> int:
+        return self._spilled_count + self._hot_count
+
+    def _hot_rows(self, start: int, stop: int) -> np.ndarray:
+        # rows start..stop of the hot decisions in chronological order
+        indices = (self._head + np.arange(start, stop)) % self.hot_size
+        return self._hot[indices]
+
+    def _spill(self) -> None:
+        if self.spill_dir is None:
+            if self._spill_root is not None:
+                os.makedirs(self._spill_root, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix="decisions-", dir=self._spill_root)
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, self.spill_dir, ignore_errors=True
+            )
+
+        rows = self._hot_rows(0, self.segment_size)
+        path = os.path.join(self.spill_dir, f"{len(self._segments):06d}.bin")
+
+        segment = np.memmap(path, dtype=DECISION_DTYPE, mode="w+", shape=len(rows))
+        segment[:] = rows
+        segment.flush()
+        del segment
+
+        self._segments.append((path, len(rows)))
+        self._spilled_count += len(rows)
+        self._head = (self._head + len(rows)) % self.hot_size
+        self._hot_count -= len(rows)
+
+    def append(self, decision: dict) -> None:
+        """
+        Append a decision, spilling the oldest hot segment if the buffer is full.
+
+        Args:
+            decision (dict): a decision with timestamp, price and quantity.
+        """
+        if self._hot_count == self.hot_size:
+            self._spill()
+
+        index = (self._head + self._hot_count) % self.hot_size
+        self._hot[index] = (
+            np.datetime64(decision["timestamp"], "ns"),
+            decision["price"],
+            decision["quantity"],
+        )
+        self._hot_count += 1
+
+    def segments(self):
+        """
+        Iterate over the decisions in chronological chunks: the spilled segments as
+        read-only memory maps, followed by the hot decisions.
+
+        Returns: an iterator of structured arrays with DECISION_DTYPE.
+        """
+        for path, length in self._segments:
+            yield np.memmap(path, dtype=DECISION_DTYPE, mode="r", shape=length)
+        if self._hot_count:
+            yield self._hot_rows(0, self._hot_count)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Load every decision into memory, for analysis.
+
+        Returns: a structured array with DECISION_DTYPE.
+        """
+        return np.concatenate(
+            [np.asarray(segment) for segment in self.segments()]
+            or [np.empty(0, dtype=DECISION_DTYPE)]
+        )
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        return {
+            "timestamp": row["timestamp"].astype("datetime64[us]").item(),
+            "price": float(row["price"]),
+            "quantity": float(row["quantity"]),
+        }
+
+    def __iter__(self):
+        for segment in self.segments():
+            for row in segment:
+                yield self._to_dict(row)
+
+    def __getitem__(self, index: int) -> dict:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("Decision index out of range")
+
+        if index >= self._spilled_count:
+            hot_index = index - self._spilled_count
+            return self._to_dict(self._hot_rows(hot_index, hot_index + 1)[0])
+
+        for path, segment_length in self._segments:
+            if index < segment_length:
+                segment = np.memmap(
+                    path, dtype=DECISION_DTYPE, mode="r", shape=segment_length
+                )
+                return self._to_dict(segment[index])
+            index -= segment_length
@@ -1,7 +1,10 @@
 from typing import Protocol
 
+import numpy as np
 import pandas as pd
 
+from src.features import FeatureStore
+
 
 class NormCalculator(Protocol):
     def calculate_norm(self, market_data: pd.DataFrame) -> float:
@@ -16,7 +19,44 @@ class NormCalculator(Protocol):
         pass
 
 
+# the field indices of OHLCV windows from LocalBTCExchange.get_market_windows
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+
+def _bfill(values: np.ndarray) -> np.ndarray:
+    # pandas' bfill along the last axis
+    valid = ~np.isnan(values)
+    positions = np.where(valid, np.arange(values.shape[-1]), values.shape[-1])
+    next_valid = np.minimum.accumulate(positions[..., ::-1], axis=-1)[..., ::-1]
+    padded = np.concatenate(
+        [values, np.full(values.shape[:-1] + (1,), np.nan)], axis=-1
+    )
+    return np.take_along_axis(padded, next_valid, axis=-1)
+
+
+def _mean(values: np.ndarray) -> np.ndarray:
+    # pandas' mean along the last axis, skipping nan without warnings
+    count = (~np.isnan(values)).sum(axis=-1)
+    total = np.nansum(values, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
 class IntraNormCalculator(NormCalculator):
+    def calculate_batch(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Calculate the norm of every OHLCV window at once.
+
+        Args:
+            windows (np.ndarray): windows of shape (windows x candles x OHLCV).
+
+        Returns: the norm of every window.
+        """
+        ranges = windows[..., HIGH] - windows[..., LOW]
+        ranges = np.where(ranges == 0, 1e-6, ranges)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return _mean((windows[..., CLOSE] - windows[..., OPEN]) / ranges)
+
     def calculate(self, market_data: pd.DataFrame) -> float:
         intracandle_norm = (
             (market_data["Close"] - market_data["Open"])
@@ -27,17 +67,56 @@ class IntraNormCalculator(NormCalculator):
 
 
 class InterNormCalculator(NormCalculator):
+    def calculate_batch(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Calculate the norm of every OHLCV window at once.
+
+        Args:
+            windows (np.ndarray): windows of shape (windows x candles x OHLCV).
+
+        Returns: the norm of every window.
+        """
+        close = windows[..., CLOSE].astype(np.float64)
+        nan = np.full(close.shape[:-1] + (1,), np.nan)
+        prev_close = np.concatenate([nan, close[..., :-1]], axis=-1)
+        prev_low = np.concatenate([nan, windows[..., :-1, LOW]], axis=-1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            changes = (close - _bfill(prev_close)) / (windows[..., HIGH] - prev_low)
+        return _mean(_bfill(changes))
+
     def calculate(self, market_data: pd.DataFrame) -> float:
         prev_close = market_data["Close"].shift(1)
         prev_low = market_data["Low"].shift(1)
 
         intercandle_norm = (
             (
-                (market_data["Close"] - prev_close.fillna(method="bfill"))
+                (market_data["Close"] - prev_close.bfill())
                 / (market_data["High"] - prev_low)
             )
-            .fillna(method="bfill")
+            .bfill()
             .mean()
         )
 
         return intercandle_norm
+
+
+class FeatureNormCalculator(NormCalculator):
+    """
+    A norm read from a precomputed feature instead of the OHLCV columns: the mean
+    of the feature over the candles of the market data window.
+
+    Args:
+        store (FeatureStore): the precomputed features of the same market data.
+        column (str): the feature column.
+    """
+
+    def __init__(self, store: FeatureStore, column: str):
+        self.store = store
+        self.column = column
+
+    def calculate(self, market_data: pd.DataFrame) -> float:
+        position = self.store.position(market_data["timestamp"].iloc[-1])
+        values = self.store.column_window(self.column, position, len(market_data))
+
+        return float(np.nanmean(values)) if len(values) else 0.0
@@ -0,0 +1,372 @@
+import datetime
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Self
+
+import numpy as np
+
+from src.exchange import INTERVAL_TIMEDELTAS, Interval, LocalBTCExchange
+from src.strategy import ExponentialDecayOHLCVStrategy
+from src.sweep import SharedMarketData
+from src.system import TradingSystem
+from src.trading_agent import AgentState, TradingAgent
+
+# the columns of the population besides the coefficients, all 8 bytes wide
+POPULATION_COLUMNS = {
+    "gamma": np.float64,
+    "threshold": np.float64,
+    "window_size": np.int64,
+    "initial_capital": np.float64,
+    "capital": np.float64,
+    "position": np.float64,
+    "long_trades": np.int64,
+    "short_trades": np.int64,
+    "fitness": np.float64,
+    "max_drawdown": np.float64,
+}
+
+
+class PopulationRow:
+    """
+    An agent's genome, trading state and metrics in the arrays of a shared
+    population. It can be passed to a TradingAgent as its state, so the agent
+    trades directly on the shared memory.
+
+    Args:
+        arrays (dict[str, np.ndarray]): the arrays of the population.
+        index (int): the index of the agent.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], index: int):
+        self._arrays = arrays
+        self.index = index
+
+    def _get(self, column: str) -> float:
+        return self._arrays[column][self.index].item()
+
+    def _set(self, column: str, value: float) -> None:
+        self._arrays[column][self.index] = value
+
+    @property
+    def capital(self) -> float:
+        return self._get("capital")
+
+    @capital.setter
+    def capital(self, value: float) -> None:
+        self._set("capital", value)
+
+    @property
+    def position(self) -> float:
+        return self._get("position")
+
+    @position.setter
+    def position(self, value: float) -> None:
+        self._set("position", value)
+
+    @property
+    def long_trades(self) -> int:
+        return self._get("long_trades")
+
+    @long_trades.setter
+    def long_trades(self, value: int) -> None:
+        self._set("long_trades", value)
+
+    @property
+    def short_trades(self) -> int:
+        return self._get("short_trades")
+
+    @short_trades.setter
+    def short_trades(self, value: int) -> None:
+        self._set("short_trades", value)
+
+    @property
+    def initial_capital(self) -> float:
+        return self._get("initial_capital")
+
+    @property
+    def fitness(self) -> float:
+        return self._get("fitness")
+
+    @fitness.setter
+    def fitness(self, value: float) -> None:
+        self._set("fitness", value)
+
+    @property
+    def max_drawdown(self) -> float:
+        return self._get("max_drawdown")
+
+    @max_drawdown.setter
+    def max_drawdown(self, value: float) -> None:
+        self._set("max_drawdown", value)
+
+    def genome(self) -> dict:
+        """
+        Get the genome of the agent.
+
+        Returns: the strategy dictionary, as created by to_dict.
+        """
+        return {
+            "type": "exponential_decay_ohlcv",
+            "coeffs": self._arrays["coeffs"][self.index].tolist(),
+            "gamma": self._get("gamma"),
+            "threshold": self._get("threshold"),
+            "window_size": self._get("window_size"),
+        }
+
+    def reset(self, genome: dict, initial_capital: float) -> None:
+        """
+        Start a new agent in the row, clearing its trading state and metrics.
+
+        Args:
+            genome (dict): the strategy dictionary, as created by to_dict.
+            initial_capital (float): the capital the agent starts with.
+        """
+        self._arrays["coeffs"][self.index] = genome["coeffs"]
+        for column in ("gamma", "threshold", "window_size"):
+            self._set(column, genome[column])
+        self._set("initial_capital", initial_capital)
+        self._set("capital", initial_capital)
+        for column in ("position", "long_trades", "short_trades"):
+            self._set(column, 0)
+        self._set("fitness", np.nan)
+        self._set("max_drawdown", np.nan)
+
+
+@dataclass
+class SharedPopulation:
+    """
+    The location of a population stored as a structure of arrays in a shared
+    memory block: the coefficients of every agent as a matrix, followed by one
+    array per column of POPULATION_COLUMNS.
+
+    Args:
+        name (str): the name of the shared memory block.
+        size (int): the number of agents.
+        coeffs (int): the number of coefficients of every genome.
+    """
+
+    name: str
+    size: int
+    coeffs: int
+
+    @classmethod
+    def create(
+        cls, size: int, coeffs: int
+    ) -> tuple["SharedPopulation", shared_memory.SharedMemory]:
+        """
+        Create a new shared memory block for the population.
+
+        Args:
+            size (int): the number of agents.
+            coeffs (int): the number of coefficients of every genome.
+
+        Returns: the location and the block, which the caller has to unlink.
+        """
+        block = shared_memory.SharedMemory(
+            create=True, size=max(1, size * 8 * (coeffs + len(POPULATION_COLUMNS)))
+        )
+        return cls(name=block.name, size=size, coeffs=coeffs), block
+
+    def arrays(self, block: shared_memory.SharedMemory) -> dict[str, np.ndarray]:
+        """
+        Views of every column in the shared memory block.
+
+        Args:
+            block (shared_memory.SharedMemory): the attached block.
+
+        Returns: the column arrays by name.
+        """
+        arrays = {
+            "coeffs": np.ndarray(
+                (self.size, self.coeffs), dtype=np.float64, buffer=block.buf, offset=0
+            )
+        }
+        offset = self.size * self.coeffs * 8
+        for column, dtype in POPULATION_COLUMNS.items():
+            arrays[column] = np.ndarray(
+                self.size, dtype=dtype, buffer=block.buf, offset=offset
+            )
+            offset += self.size * 8
+        return arrays
+
+    def attach(self) -> tuple[dict[str, np.ndarray], shared_memory.SharedMemory]:
+        """
+        Attach to the shared memory block.
+
+        Returns: the column arrays and the block, which has to outlive the arrays.
+        """
+        block = shared_memory.SharedMemory(name=self.name)
+        return self.arrays(block), block
+
+
+_worker_exchange: LocalBTCExchange | None = None
+_worker_arrays: dict[str, np.ndarray] | None = None
+_worker_blocks: list[shared_memory.SharedMemory] = []
+_worker_settings: dict = {}
+
+
+def _initialize_worker(
+    market: SharedMarketData, population: SharedPopulation, settings: dict
+) -> None:
+    global _worker_exchange, _worker_arrays, _worker_settings
+    _worker_exchange, market_block = market.attach()
+    _worker_arrays, population_block = population.attach()
+    _worker_blocks.extend([market_block, population_block])
+    _worker_settings = settings
+
+
+def evaluate_rows(
+    start: int,
+    stop: int,
+    start_time: datetime,
+    generation_lifespan: int,
+    interval: Interval,
+) -> None:
+    """
+    Evaluate the agents of a slice of the worker's shared population, trading
+    directly on their rows and storing their fitness and max drawdown there.
+
+    Args:
+        start (int): the index of the first agent.
+        stop (int): the index after the last agent.
+        start_time (datetime): the time the generation starts from.
+        generation_lifespan (int): the number of ticks to trade.
+        interval (Interval): the interval of the ticks.
+    """
+    rows = [PopulationRow(_worker_arrays, i) for i in range(start, stop)]
+    agents = [
+        TradingAgent(
+            name=f"agent_{row.index}",
+            exchange=_worker_exchange,
+            strategy=ExponentialDecayOHLCVStrategy.from_dict(row.genome()),
+            initial_capital=row.initial_capital,
+            state=row,
+            **_worker_settings,
+        )
+        for row in rows
+    ]
+
+    timedelta = INTERVAL_TIMEDELTAS[interval]
+    for step in range(generation_lifespan):
+        time = start_time + timedelta * (step + 1)
+        for agent in agents:
+            agent.update(time, 100, interval)
+
+    # the rows were reset, so the agents calculate both from their decisions
+    for row, agent in zip(rows, agents):
+        row.max_drawdown = agent.calculate_max_drawdown()
+        row.fitness = agent.fitness()
+
+
+class ParallelTradingSystem(TradingSystem):
+    """
+    A trading system evaluating its population in a process pool. The market data
+    and the population live in shared memory, so every worker trades its slice of
+    the agents in place and only the slice bounds are sent per generation.
+
+    The agents of the system are views over their rows: their capital, position
+    and trade counts are the ones traded by the workers, and their fitness and max
+    drawdown the ones the workers recorded. Their decisions stay in the workers.
+
+    Args:
+        exchange (LocalBTCExchange): the exchange with float64 market data.
+        initial_population (int): the number of agents.
+        max_workers (int): the number of processes, defaults to the cpu count.
+        **kwargs: the other arguments of TradingSystem.
+    """
+
+    def __init__(
+        self,
+        exchange: LocalBTCExchange,
+        initial_population: int,
+        max_workers: int | None = None,
+        **kwargs,
+    ):
+        super().__init__(exchange, initial_population, **kwargs)
+
+        self.market, self._market_block = SharedMarketData.create(exchange)
+        self.shared, self._population_block = SharedPopulation.create(
+            initial_population, len(self.agents[0].strategy.coeffs)
+        )
+        self.arrays = self.shared.arrays(self._population_block)
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # the workers create their agents with the settings of the system's
+        agent = self.agents[0]
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_initialize_worker,
+            initargs=(
+                self.market,
+                self.shared,
+                {
+                    "position_size_percent": agent.position_size_percent,
+                    "min_trade_size": agent.min_trade_size,
+                    "transaction_fee": agent.transaction_fee,
+                },
+            ),
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def evaluate(self, start_time: datetime) -> None:
+        """
+        Evaluate the population in the workers.
+        """
+        for i, agent in enumerate(self.agents):
+            row = PopulationRow(self.arrays, i)
+            row.reset(agent.strategy.to_dict(), agent.initial_capital)
+            agent.state = row
+
+        bounds = np.linspace(0, len(self.agents), self.max_workers + 1, dtype=int)
+        futures = [
+            self.executor.submit(
+                evaluate_rows,
+                start,
+                stop,
+                start_time,
+                self.generation_lifespan,
+                self.interval,
+            )
+            for start, stop in itertools.pairwise(bounds)
+            if start < stop
+        ]
+        for future in futures:
+            future.result()
+
+    def fitnesses(self) -> list[float]:
+        """
+        Get the fitness of every agent of the evaluated generation.
+
+        Returns: the fitness scores, in the order of the agents.
+        """
+        return self.arrays["fitness"][: len(self.agents)].tolist()
+
+    def close(self) -> None:
+        """
+        Stop the workers and free the shared memory. The agents keep a copy of
+        their last trading state.
+        """
+        self.executor.shutdown()
+        for agent in self.agents:
+            if isinstance(agent.state, PopulationRow):
+                row = agent.state
+                agent.state = AgentState(
+                    row.capital,
+                    row.position,
+                    row.long_trades,
+                    row.short_trades,
+                    row.fitness,
+                    row.max_drawdown,
+                )
+        self.arrays = None
+        for block in (self._market_block, self._population_block):
+            block.close()
+            block.unlink()
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.exchange import LocalBTCExchange
+from src.strategy import TradingStrategy
+
+
+@dataclass
+class PrecisionReport:
+    """
+    How closely decisions on compact market data follow the float64 decisions.
+
+    Args:
+        decisions (int): the number of compared decisions.
+        action_agreement (float): the fraction of decisions with the same action.
+        max_confidence_error (float): the largest absolute confidence difference.
+        mean_confidence_error (float): the mean absolute confidence difference.
+        reference_bytes (int): the memory of the float64 market data.
+        candidate_bytes (int): the memory of the compact market data.
+    """
+
+    decisions: int
+    action_agreement: float
+    max_confidence_error: float
+    mean_confidence_error: float
+    reference_bytes: int
+    candidate_bytes: int
+
+
+def compare_decisions(
+    reference: LocalBTCExchange,
+    candidate: LocalBTCExchange,
+    strategies: list[TradingStrategy],
+    times: list,
+    max_history_count: int = 100,
+) -> PrecisionReport:
+    """
+    Let every strategy decide at every time on both exchanges and compare the
+    decisions.
+
+    Args:
+        reference (LocalBTCExchange): the exchange with float64 market data.
+        candidate (LocalBTCExchange): the exchange with compact market data.
+        strategies (list[TradingStrategy]): the strategies deciding.
+        times (list): the times to decide at.
+        max_history_count (int): the number of candles every decision sees.
+
+    Returns: the comparison report.
+    """
+    agreements = []
+    errors = []
+    for now in times:
+        reference_data = reference.get_market_data(now, max_history_count)
+        candidate_data = candidate.get_market_data(now, max_history_count)
+        for strategy in strategies:
+            reference_action, reference_confidence, _ = strategy.decide(reference_data)
+            candidate_action, candidate_confidence, _ = strategy.decide(candidate_data)
+            agreements.append(reference_action == candidate_action)
+            errors.append(
+                abs(float(reference_confidence) - float(candidate_confidence))
+            )
+
+    return PrecisionReport(
+        decisions=len(errors),
+        action_agreement=float(np.mean(agreements)) if agreements else 1.0,
+        max_confidence_error=float(np.max(errors)) if errors else 0.0,
+        mean_confidence_error=float(np.mean(errors)) if errors else 0.0,
+        reference_bytes=reference.memory_usage(),
+        candidate_bytes=candidate.memory_usage(),
+    )
@@ -0,0 +1,237 @@
+import json
+import queue
+import sqlite3
+import threading
+from dataclasses import astuple, dataclass
+
+from src.trading_agent import TradingAgent
+
+
+@dataclass
+class GenerationRecord:
+    """
+    The result of one agent in one generation.
+
+    Args:
+        run_id (str): the run the generation belongs to.
+        generation (int): the index of the generation.
+        agent (str): the name of the agent.
+        genome (dict): the strategy of the agent, as returned by to_dict.
+        fitness (float): the fitness of the agent.
+        max_drawdown (float): the maximum drawdown of the agent.
+        long_trades (int): the number of executed long trades.
+        short_trades (int): the number of executed short trades.
+        capital (float): the capital of the agent at the end of the generation.
+    """
+
+    run_id: str
+    generation: int
+    agent: str
+    genome: dict
+    fitness: float
+    max_drawdown: float
+    long_trades: int
+    short_trades: int
+    capital: float
+
+    @classmethod
+    def from_agent(
+        cls, run_id: str, generation: int, agent: TradingAgent
+    ) -> "GenerationRecord":
+        return cls(
+            run_id=run_id,
+            generation=generation,
+            agent=agent.name,
+            genome=agent.strategy.to_dict(),
+            fitness=float(agent.fitness()),
+            max_drawdown=agent.calculate_max_drawdown(),
+            long_trades=agent.long_trades,
+            short_trades=agent.short_trades,
+            capital=float(agent.capital),
+        )
+
+
+class ResultsStore:
+    """
+    An append-only SQLite table of generation records.
+
+    Args:
+        path (str): the path of the database file.
+    """
+
+    COLUMNS = (
+        "run_id",
+        "generation",
+        "agent",
+        "genome",
+        "fitness",
+        "max_drawdown",
+        "long_trades",
+        "short_trades",
+        "capital",
+    )
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        # readers can query while the sink's writer thread appends
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                run_id TEXT NOT NULL,
+                generation INTEGER NOT NULL,
+                agent TEXT NOT NULL,
+                genome TEXT NOT NULL,
+                fitness REAL NOT NULL,
+                max_drawdown REAL NOT NULL,
+                long_trades INTEGER NOT NULL,
+                short_trades INTEGER NOT NULL,
+                capital REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_fitness ON results (fitness DESC)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_run ON results (run_id, fitness DESC)"
+        )
+        self.connection.commit()
+
+    def append(self, records: list[GenerationRecord]) -> None:
+        """
+        Append the records in a single transaction.
+
+        Args:
+            records (list[GenerationRecord]): the records to append.
+        """
+        rows = []
+        for record in records:
+            row = list(astuple(record))
+            row[3] = json.dumps(record.genome)
+            rows.append(row)
+
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO results ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                rows,
+            )
+
+    def best_genomes(self, limit: int = 10, run_id: str | None = None) -> list[dict]:
+        """
+        Get the records with the highest fitness.
+
+        Args:
+            limit (int): the maximum number of records.
+            run_id (str): only consider this run, defaults to all runs.
+
+        Returns: the records as dictionaries, best first.
+        """
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM results"
+        parameters: tuple = ()
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            parameters = (run_id,)
+        query += " ORDER BY fitness DESC LIMIT ?"
+
+        rows = self.connection.execute(query, parameters + (limit,)).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(zip(self.COLUMNS, row))
+            result["genome"] = json.loads(result["genome"])
+            results.append(result)
+        return results
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ResultsSink:
+    """
+    Buffers generation records and appends them to a ResultsStore in batches
+    from a background thread, so the simulation never waits on the disk.
+
+    Args:
+        path (str): the path of the database file.
+        run_id (str): the run the records belong to.
+        batch_size (int): the number of buffered records that triggers a write.
+    """
+
+    def __init__(self, path: str, run_id: str, batch_size: int = 1000):
+        self.path = path
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.buffer: list[GenerationRecord] = []
+        self.error: Exception | None = None
+        self._batches: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def _write(self) -> None:
+        # sqlite connections belong to the thread that opened them
+        store = None
+        try:
+            store = ResultsStore(self.path)
+        except (sqlite3.Error, OSError) as error:
+            # keep draining the queue, so flush doesn't wait forever
+            self.error = error
+        try:
+            while True:
+                batch = self._batches.get()
+                try:
+                    if batch is None:
+                        return
+                    if self.error is None:
+                        store.append(batch)
+                # any error must reach the caller, a dead writer would leave
+                # flush waiting on the queue forever
+                except Exception as error:  # noqa: BLE001
+                    self.error = error
+                finally:
+                    self._batches.task_done()
+        finally:
+            if store is not None:
+                store.close()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            raise RuntimeError("Writing results failed") from self.error
+
+    def record_generation(self, generation: int, agents: list[TradingAgent]) -> None:
+        """
+        Buffer the results of the agents of a generation.
+
+        Args:
+            generation (int): the index of the generation.
+            agents (list[TradingAgent]): the evaluated agents.
+        """
+        self._raise_error()
+        self.buffer.extend(
+            GenerationRecord.from_agent(self.run_id, generation, agent)
+            for agent in agents
+        )
+        if len(self.buffer) >= self.batch_size:
+            self._batches.put(self.buffer)
+            self.buffer = []
+
+    def flush(self) -> None:
+        """
+        Write the buffered records and wait until every batch is stored.
+        """
+        if self.buffer:
+            self._batches.put(self.buffer)
+            self.buffer = []
+        self._batches.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Flush the buffered records and stop the writer thread.
+        """
+        try:
+            self.flush()
+        finally:
+            self._batches.put(None)
+            self._writer.join()
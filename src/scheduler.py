@@ -0,0 +1,220 @@
+import datetime
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Self
+
+import numpy as np
+
+from src.exchange import Interval
+from src.trading_agent import TradingAgent
+
+PRIORITIES: dict[str, Callable[[TradingAgent], float]] = {
+    "capital": lambda agent: agent.capital,
+    # walks every decision of the agent, costly for long histories
+    "fitness": lambda agent: agent.fitness(),
+}
+
+
+@dataclass
+class TickReport:
+    """
+    How the agents kept up with one tick.
+
+    The percentiles and the worst case cover the late latencies too, so they are
+    provisional until every missed agent has finished.
+
+    Args:
+        now (datetime): the time of the tick.
+        budget (float): the latency budget in seconds.
+        latencies (dict[str, float]): the update duration in seconds of every agent
+            that finished within the budget.
+        late_latencies (dict[str, float]): the update duration in seconds of the
+            missed agents, added by the worker threads as they finish.
+        missed (list[str]): the agents that did not finish within the budget.
+        skipped (list[str]): the agents still busy with an earlier tick.
+    """
+
+    now: datetime
+    budget: float
+    latencies: dict[str, float] = field(default_factory=dict)
+    late_latencies: dict[str, float] = field(default_factory=dict)
+    missed: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_late(self, name: str, latency: float) -> None:
+        """
+        Record the latency of a missed agent, from any thread.
+
+        Args:
+            name (str): the name of the agent.
+            latency (float): the update duration in seconds.
+        """
+        with self._lock:
+            self.late_latencies[name] = latency
+
+    def _durations(self) -> list[float]:
+        with self._lock:
+            return [*self.latencies.values(), *self.late_latencies.values()]
+
+    def _percentile(self, percentile: float) -> float:
+        durations = self._durations()
+        if not durations:
+            return float("nan")
+        return float(np.percentile(durations, percentile))
+
+    @property
+    def p50(self) -> float:
+        return self._percentile(50)
+
+    @property
+    def p99(self) -> float:
+        return self._percentile(99)
+
+    @property
+    def worst(self) -> float:
+        return max(self._durations(), default=float("nan"))
+
+
+class RealtimeScheduler:
+    """
+    Updates agents on a thread pool under a per-tick latency budget, so that a slow
+    strategy can't delay the other agents past the end of the candle.
+
+    Agents are started in order of priority. When the budget runs out, agents that
+    haven't started are cancelled, and agents still running finish in the
+    background and are skipped until they are done. Both count as missed. An
+    exception of an update is raised by the tick, or by the next tick if the agent
+    was late, after the other agents were accounted for.
+
+    Args:
+        agents (list[TradingAgent]): the agents.
+        budget (float): the latency budget per tick in seconds.
+        max_workers (int): the number of threads, defaults to ThreadPoolExecutor's.
+        priority (str | Callable[[TradingAgent], float]): a key of PRIORITIES or a
+            function, agents with a higher value are started first.
+    """
+
+    def __init__(
+        self,
+        agents: list[TradingAgent],
+        budget: float,
+        max_workers: int | None = None,
+        priority: str | Callable[[TradingAgent], float] = "capital",
+    ):
+        if budget <= 0:
+            raise ValueError("Budget must be positive")
+
+        self.agents = agents
+        self.budget = budget
+        self.priority = PRIORITIES[priority] if isinstance(priority, str) else priority
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.reports: list[TickReport] = []
+        self.missed: Counter = Counter()
+        self._running: dict[str, Future] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _update(
+        agent: TradingAgent, now: datetime, max_history_count: int, interval: Interval
+    ) -> float:
+        started = time.perf_counter()
+        agent.update(now, max_history_count, interval)
+        return time.perf_counter() - started
+
+    def tick(
+        self, now: datetime, max_history_count: int, interval: Interval
+    ) -> TickReport:
+        """
+        Update every agent for a new candle within the latency budget.
+
+        Args:
+            now (datetime): the time of the candle.
+            max_history_count (int): the number of candles every agent sees.
+            interval (Interval): the interval of the candles.
+
+        Returns: the report of the tick.
+        """
+        deadline = time.perf_counter() + self.budget
+        report = TickReport(now=now, budget=self.budget)
+
+        # a late agent may have failed after its tick was reported, its error is
+        # raised once every agent still running is tracked
+        error = None
+        running = {}
+        for name, future in self._running.items():
+            if not future.done():
+                running[name] = future
+            elif error is None:
+                error = future.exception()
+        self._running = running
+        if error is not None:
+            raise error
+
+        ready = []
+        for agent in self.agents:
+            if agent.name in self._running:
+                report.skipped.append(agent.name)
+            else:
+                ready.append(agent)
+        ready.sort(key=self.priority, reverse=True)
+
+        futures = {
+            self.executor.submit(
+                self._update, agent, now, max_history_count, interval
+            ): agent.name
+            for agent in ready
+        }
+
+        finished = set()
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            finished |= done
+
+        for future, name in futures.items():
+            if future in finished:
+                if future.exception() is None:
+                    report.latencies[name] = future.result()
+                continue
+            if not future.cancel():
+                self._running[name] = future
+                # late agents are added to the report when they finish
+                future.add_done_callback(
+                    lambda future, name=name: self._record_late(report, name, future)
+                )
+            report.missed.append(name)
+        self.missed.update(report.missed + report.skipped)
+
+        self.reports.append(report)
+        for future in finished:
+            if future.exception() is not None:
+                raise future.exception()
+        return report
+
+    @staticmethod
+    def _record_late(report: TickReport, name: str, future: Future) -> None:
+        if future.exception() is None:
+            report.record_late(name, future.result())
+
+    def close(self) -> None:
+        """
+        Cancel the agents that haven't started and wait for the running ones.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,168 @@
+import datetime
+import math
+import random
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from src.exchange import INTERVAL_TIMEDELTAS, Exchange, Interval
+from src.strategy import TradingStrategy
+from src.system import TradingSystem
+
+
+@dataclass
+class ScreeningReport:
+    """
+    The outcome of one two-stage evaluation.
+
+    Args:
+        screening_fitness (list[float]): the cheap fitness of every candidate.
+        full_fitness (dict[int, float]): the full resolution fitness by candidate index.
+        promoted (list[int]): the indices of the promoted candidates.
+        calibration (list[int]): the indices of the non-promoted candidates that were
+            evaluated at full resolution to measure the ranking quality.
+    """
+
+    screening_fitness: list[float]
+    full_fitness: dict[int, float] = field(default_factory=dict)
+    promoted: list[int] = field(default_factory=list)
+    calibration: list[int] = field(default_factory=list)
+
+    def rank_correlation(self) -> float:
+        """
+        Spearman rank correlation between the cheap and the full resolution fitness
+        of every candidate evaluated at both fidelities.
+
+        Returns: the correlation, or nan if fewer than two candidates were evaluated.
+        """
+        indices = sorted(self.full_fitness)
+        if len(indices) < 2:
+            return float("nan")
+
+        cheap = pd.Series([self.screening_fitness[i] for i in indices]).rank()
+        full = pd.Series([self.full_fitness[i] for i in indices]).rank()
+
+        return float(cheap.corr(full))
+
+
+class MultiFidelityScreener:
+    """
+    Screens candidate strategies on coarse market data and only promotes the best
+    of them to a full resolution evaluation in the trading system.
+
+    Args:
+        system (TradingSystem): the system running the full resolution evaluation.
+        screening_exchange (Exchange): an exchange over coarsened data of the same
+            source, e.g. LocalBTCExchange.resample(Interval.DAY).
+        screening_interval (Interval): the interval passed to the screened agents.
+        screening_timedelta (datetime.timedelta): the time between two screening ticks.
+        screening_lifespan (int): the number of screening ticks per candidate,
+            defaults to the ticks covering the system's generation lifespan.
+        promote_fraction (float): the fraction of candidates promoted to full
+            resolution.
+        calibration_fraction (float): the fraction of non-promoted candidates that is
+            also evaluated at full resolution to measure the rank correlation.
+        on_report (Callable[[ScreeningReport], None]): called after every evaluation.
+    """
+
+    def __init__(
+        self,
+        system: TradingSystem,
+        screening_exchange: Exchange,
+        screening_interval: Interval = Interval.DAY,
+        screening_timedelta: datetime.timedelta = datetime.timedelta(days=1),
+        screening_lifespan: int | None = None,
+        promote_fraction: float = 0.25,
+        calibration_fraction: float = 0.0,
+        on_report: Callable[[ScreeningReport], None] | None = None,
+    ):
+        if not 0 < promote_fraction <= 1:
+            raise ValueError("Promote fraction must be in (0, 1]")
+        if not 0 <= calibration_fraction <= 1:
+            raise ValueError("Calibration fraction must be in [0, 1]")
+
+        self.system = system
+        self.screening_exchange = screening_exchange
+        self.screening_interval = screening_interval
+        self.screening_timedelta = screening_timedelta
+        if screening_lifespan is None:
+            # screen the same market period as the full evaluation ranks
+            span = system.generation_lifespan * INTERVAL_TIMEDELTAS[system.interval]
+            screening_lifespan = max(1, math.ceil(span / screening_timedelta))
+        self.screening_lifespan = screening_lifespan
+        self.promote_fraction = promote_fraction
+        self.calibration_fraction = calibration_fraction
+        self.on_report = on_report
+        self.reports: list[ScreeningReport] = []
+
+    def screen(
+        self, strategies: list[TradingStrategy], start_time: datetime
+    ) -> list[float]:
+        """
+        Evaluate the strategies on the coarse market data.
+
+        Args:
+            strategies (list[TradingStrategy]): the candidate strategies.
+            start_time (datetime): the time the screening starts from, floored to
+                the screening ticks.
+
+        Returns: the cheap fitness of every strategy.
+        """
+        agents = [
+            self.system.create_agent(
+                f"screen_{i}", strategy, exchange=self.screening_exchange
+            )
+            for i, strategy in enumerate(strategies)
+        ]
+
+        start_time = pd.Timestamp(start_time).floor(self.screening_timedelta)
+        for step in range(self.screening_lifespan):
+            time = start_time + self.screening_timedelta * (step + 1)
+            for agent in agents:
+                agent.update(time, 100, self.screening_interval)
+
+        return [agent.fitness() for agent in agents]
+
+    def evaluate(self, start_time: datetime) -> ScreeningReport:
+        """
+        Screen the system's current agents and evaluate the promoted ones at full
+        resolution. The system is left with the promoted agents only.
+
+        Args:
+            start_time (datetime): the time both stages start from.
+
+        Returns: the screening report.
+        """
+        strategies = [agent.strategy for agent in self.system.agents]
+        report = ScreeningReport(screening_fitness=self.screen(strategies, start_time))
+
+        ranked = sorted(
+            range(len(strategies)),
+            key=lambda i: report.screening_fitness[i],
+            reverse=True,
+        )
+        promoted_count = max(1, math.ceil(len(ranked) * self.promote_fraction))
+        report.promoted = ranked[:promoted_count]
+
+        rejected = ranked[promoted_count:]
+        calibration_count = round(len(rejected) * self.calibration_fraction)
+        report.calibration = sorted(random.sample(rejected, calibration_count))
+
+        evaluated = report.promoted + report.calibration
+        agents = [
+            self.system.create_agent(f"agent_{i}", strategies[i]) for i in evaluated
+        ]
+        self.system.agents = agents
+        self.system.evaluate(start_time)
+
+        report.full_fitness = {
+            i: agent.fitness() for i, agent in zip(evaluated, agents)
+        }
+        self.system.agents = agents[:promoted_count]
+
+        self.reports.append(report)
+        if self.on_report is not None:
+            self.on_report(report)
+
+        return report
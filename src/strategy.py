@@ -4,7 +4,7 @@ from typing import Protocol
 import numpy as np
 import pandas as pd
 
-from src.norm import InterNormCalculator, IntraNormCalculator, NormCalculator
+from src.norm import VOLUME, InterNormCalculator, IntraNormCalculator, NormCalculator
 
 
 class TradeAction(str, Enum):
@@ -78,6 +78,7 @@ class ExponentialDecayOHLCVStrategy:
 
     def decide(self, market_data: pd.DataFrame) -> tuple[TradeAction, float, dict]:
         window_size = min(self.window_size, len(market_data))
+        market_data = market_data.tail(window_size)
         decay_weights = np.exp(-self.gamma * np.arange(window_size)[::-1])
 
         v_avg = market_data["Volume"].mean()
@@ -101,12 +102,45 @@ class ExponentialDecayOHLCVStrategy:
             {},
         )
 
+    def decide_batch(self, windows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Decide on every OHLCV window at once, e.g. on the windows of
+        LocalBTCExchange.get_market_windows. Every norm calculator needs a
+        calculate_batch method.
+
+        Args:
+            windows (np.ndarray): windows of shape (windows x candles x OHLCV).
+
+        Returns: the actions and the confidences of every window.
+        """
+        window_size = min(self.window_size, windows.shape[1])
+        windows = windows[:, windows.shape[1] - window_size :, :]
+        decay_weights = np.exp(-self.gamma * np.arange(window_size)[::-1])
+
+        volume = windows[..., VOLUME].astype(np.float64)
+        v_avg = volume.mean(axis=1, keepdims=True)
+
+        sum = 0
+        for i, norm_calculator in enumerate(self.norm_calculators):
+            sum = sum + self.coeffs[i] * norm_calculator.calculate_batch(windows)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = sum[:, np.newaxis] * decay_weights * volume / v_avg
+
+        confidences = np.clip(np.nansum(score, axis=1), -1, 1)
+        actions = np.empty(len(confidences), dtype=object)
+        actions[:] = TradeAction.HOLD
+        actions[confidences > self.threshold] = TradeAction.LONG
+        actions[confidences < -self.threshold] = TradeAction.SHORT
+
+        return actions, confidences
+
     def mutate(self, mutation_rate: float) -> None:
         for i in range(len(self.coeffs)):
             self.coeffs[i] += np.random.normal(0, mutation_rate)
         self.gamma += np.random.normal(0, mutation_rate)
         self.threshold += np.random.normal(0, mutation_rate)
-        self.window_size = min(self.window_size + np.random.randint(-1, 2), 2)
+        self.window_size = max(self.window_size + np.random.randint(-1, 2), 2)
 
     def to_dict(self) -> dict:
         return {
@@ -114,5 +148,22 @@ class ExponentialDecayOHLCVStrategy:
             "coeffs": self.coeffs,
             "gamma": self.gamma,
             "threshold": self.threshold,
-            "window_size": self.window_size,
+            "window_size": int(self.window_size),
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExponentialDecayOHLCVStrategy":
+        """
+        Create the strategy from a dictionary created by to_dict.
+
+        Args:
+            data (dict): a dictionary containing the strategy.
+
+        Returns: the strategy.
+        """
+        return cls(
+            coeffs=list(data["coeffs"]),
+            gamma=data["gamma"],
+            window_size=data["window_size"],
+            threshold=data["threshold"],
+        )
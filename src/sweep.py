@@ -0,0 +1,329 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.config import RunConfig
+from src.exchange import OHLCV_COLUMNS, LocalBTCExchange
+from src.system import create_system
+
+
+def grid_search(space: dict[str, list]) -> list[dict]:
+    """
+    Every combination of the values of the search space.
+
+    Args:
+        space (dict[str, list]): the values of every swept parameter.
+
+    Returns: the parameters of every trial.
+    """
+    names = sorted(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+
+
+def random_search(space: dict[str, list | dict], samples: int, seed: int = 0) -> list:
+    """
+    Random samples of the search space. A list is sampled as choices, a dictionary
+    with low and high as a uniform range, of integers if both bounds are integers.
+
+    Args:
+        space (dict[str, list | dict]): the values or range of every swept parameter.
+        samples (int): the number of trials.
+        seed (int): the seed of the sampling.
+
+    Returns: the parameters of every trial.
+    """
+    rng = random.Random(seed)
+    trials = []
+    for _ in range(samples):
+        trial = {}
+        for name in sorted(space):
+            values = space[name]
+            if isinstance(values, dict):
+                low, high = values["low"], values["high"]
+                if isinstance(low, int) and isinstance(high, int):
+                    trial[name] = rng.randint(low, high)
+                else:
+                    trial[name] = rng.uniform(low, high)
+            else:
+                trial[name] = rng.choice(values)
+        trials.append(trial)
+    return trials
+
+
+def trial_id(parameters: dict) -> str:
+    """
+    A stable id of the trial parameters, used to skip finished trials on resume.
+
+    Args:
+        parameters (dict): the trial parameters.
+
+    Returns: the id.
+    """
+    encoded = json.dumps(parameters, sort_keys=True).encode()
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+@dataclass
+class SharedMarketData:
+    """
+    The location of market data copied into a shared memory block, as rows of
+    int64 nanosecond timestamps followed by the float64 OHLCV columns.
+
+    Args:
+        name (str): the name of the shared memory block.
+        rows (int): the number of candles.
+    """
+
+    name: str
+    rows: int
+
+    @classmethod
+    def create(
+        cls, exchange: LocalBTCExchange
+    ) -> tuple["SharedMarketData", shared_memory.SharedMemory]:
+        """
+        Copy the exchange's market data into a new shared memory block.
+
+        Args:
+            exchange (LocalBTCExchange): the exchange with float64 market data.
+
+        Returns: the location and the block, which the caller has to unlink.
+        """
+        rows = len(exchange.market_data)
+        block = shared_memory.SharedMemory(
+            create=True, size=max(1, rows * 8 * (len(OHLCV_COLUMNS) + 1))
+        )
+        shared = cls(name=block.name, rows=rows)
+
+        arrays = shared.arrays(block)
+        arrays["timestamp"][:] = exchange.market_data["timestamp"].to_numpy(
+            dtype="datetime64[ns]"
+        )
+        for column in OHLCV_COLUMNS:
+            arrays[column][:] = exchange.market_data[column].to_numpy(dtype=np.float64)
+
+        return shared, block
+
+    def arrays(self, block: shared_memory.SharedMemory) -> dict[str, np.ndarray]:
+        """
+        Views of every column in the shared memory block.
+
+        Args:
+            block (shared_memory.SharedMemory): the attached block.
+
+        Returns: the column arrays by name.
+        """
+        arrays = {
+            "timestamp": np.ndarray(
+                self.rows, dtype="datetime64[ns]", buffer=block.buf, offset=0
+            )
+        }
+        for i, column in enumerate(OHLCV_COLUMNS):
+            arrays[column] = np.ndarray(
+                self.rows,
+                dtype=np.float64,
+                buffer=block.buf,
+                offset=(i + 1) * self.rows * 8,
+            )
+        return arrays
+
+    def attach(self) -> tuple[LocalBTCExchange, shared_memory.SharedMemory]:
+        """
+        Attach to the shared memory block and create a read-only exchange over it
+        without copying the market data.
+
+        Returns: the exchange and the block, which has to outlive the exchange.
+        """
+        block = shared_memory.SharedMemory(name=self.name)
+        arrays = self.arrays(block)
+        for array in arrays.values():
+            array.flags.writeable = False
+
+        exchange = LocalBTCExchange.from_frame(
+            pd.DataFrame(arrays, copy=False), copy=False
+        )
+        return exchange, block
+
+
+_worker_exchange: LocalBTCExchange | None = None
+_worker_block: shared_memory.SharedMemory | None = None
+
+
+def _initialize_worker(shared: SharedMarketData) -> None:
+    global _worker_exchange, _worker_block
+    _worker_exchange, _worker_block = shared.attach()
+
+
+def run_trial(config: RunConfig, exchange: LocalBTCExchange | None = None) -> dict:
+    """
+    Run a trading system and summarize its last generation.
+
+    Args:
+        config (RunConfig): the configuration of the trial.
+        exchange (LocalBTCExchange): the market data, defaults to the worker's
+            shared market data.
+
+    Returns: the results of the trial.
+    """
+    exchange = exchange or _worker_exchange
+    started = time.perf_counter()
+
+    system = create_system(config, exchange)
+    results = {}
+
+    def on_generation(generation: int) -> None:
+        fitness = [agent.fitness() for agent in system.agents]
+        best = system.agents[int(np.argmax(fitness))]
+        results.update(
+            {
+                "best_fitness": max(fitness),
+                "mean_fitness": float(np.mean(fitness)),
+                "best_max_drawdown": best.calculate_max_drawdown(),
+                "best_genome": json.dumps(best.strategy.to_dict()),
+            }
+        )
+
+    system.run(
+        pd.Timestamp(config.start_time),
+        config.generations,
+        on_generation=on_generation,
+    )
+    results["seconds"] = time.perf_counter() - started
+    return results
+
+
+class SweepRunner:
+    """
+    Runs many trading system configurations concurrently in a process pool over
+    one shared read-only copy of the market data. Every finished trial is appended
+    to a csv table, and trials already in the table are skipped, so an interrupted
+    sweep resumes where it stopped.
+
+    Args:
+        base_config (RunConfig): the configuration the trial parameters override.
+        trials (list[dict]): the parameters of every trial.
+        output_path (str): the csv table of the results.
+        max_workers (int): the number of processes, defaults to the cpu count.
+    """
+
+    def __init__(
+        self,
+        base_config: RunConfig,
+        trials: list[dict],
+        output_path: str,
+        max_workers: int | None = None,
+    ):
+        if any("data_path" in parameters for parameters in trials):
+            raise ValueError("The data path is shared by every trial")
+
+        self.base_config = base_config
+        self.trials = trials
+        self.output_path = output_path
+        self.max_workers = max_workers
+
+    def _trial_config(self, parameters: dict) -> RunConfig:
+        config = {**self.base_config.to_dict(), **parameters}
+        # unseeded trials get a seed of their own, so the workers don't share the
+        # random state they forked with and a rerun reproduces the trial
+        if config["seed"] is None:
+            config["seed"] = int(trial_id(parameters), 16) % 2**31
+        return RunConfig.from_dict(config)
+
+    def pending_trials(self) -> list[dict]:
+        """
+        Get the trials that are not in the results table yet.
+
+        Returns: the parameters of the pending trials.
+        """
+        finished = set()
+        if os.path.exists(self.output_path):
+            finished = set(pd.read_csv(self.output_path, dtype=str)["trial_id"])
+
+        return [
+            parameters
+            for parameters in self.trials
+            if trial_id(parameters) not in finished
+        ]
+
+    def _append(self, row: dict) -> None:
+        if not os.path.exists(self.output_path):
+            pd.DataFrame([row]).to_csv(self.output_path, index=False)
+            return
+
+        columns = list(pd.read_csv(self.output_path, nrows=0).columns)
+        if set(row) <= set(columns):
+            pd.DataFrame([row], columns=columns).to_csv(
+                self.output_path, mode="a", header=False, index=False
+            )
+            return
+
+        # a new parameter was swept, rewrite the table with the union of columns
+        table = pd.read_csv(self.output_path, dtype={"trial_id": str})
+        temporary_path = f"{self.output_path}.tmp"
+        pd.concat([table, pd.DataFrame([row])], ignore_index=True).to_csv(
+            temporary_path, index=False
+        )
+        os.replace(temporary_path, self.output_path)
+
+    def run(self) -> pd.DataFrame:
+        """
+        Run the pending trials.
+
+        Returns: the results table of every finished trial.
+        """
+        pending = self.pending_trials()
+        # validate every trial before starting any
+        configs = {trial_id(p): self._trial_config(p) for p in pending}
+
+        error = None
+        if configs:
+            exchange = LocalBTCExchange(self.base_config.data_path)
+            shared, block = SharedMarketData.create(exchange)
+            del exchange
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_initialize_worker,
+                    initargs=(shared,),
+                ) as executor:
+                    futures = {
+                        executor.submit(run_trial, configs[trial_id(p)]): p
+                        for p in pending
+                    }
+                    for future in as_completed(futures):
+                        parameters = futures[future]
+                        try:
+                            results = future.result()
+                        except Exception as exception:  # noqa: BLE001
+                            # a trial can fail in any way, keep the trials that
+                            # still finish so a resume only reruns the failed ones
+                            error = error or exception
+                            continue
+                        self._append(
+                            {
+                                "trial_id": trial_id(parameters),
+                                **parameters,
+                                **results,
+                            }
+                        )
+            finally:
+                block.close()
+                block.unlink()
+
+        if error is not None:
+            raise error
+        if not os.path.exists(self.output_path):
+            return pd.DataFrame(columns=["trial_id"])
+        return pd.read_csv(self.output_path, dtype={"trial_id": str})
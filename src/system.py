@@ -1,46 +1,42 @@
+import copy
 import datetime
 import random
+from collections.abc import Callable
 
 import numpy as np
 
-from src.exchange import Interval
-from src.strategy import ExponentialDecayOHLCVStrategy
+from src.config import RunConfig
+from src.exchange import INTERVAL_TIMEDELTAS, Exchange, Interval
+from src.strategy import ExponentialDecayOHLCVStrategy, TradingStrategy
 from src.trading_agent import TradingAgent
 
 
 class TradingSystem:
     def __init__(
         self,
+        exchange: Exchange,
         initial_population: int,
         generation_lifespan: int = 52,
         interval: Interval = Interval.HOUR,
+        mutation_rate: float = 0.05,
+        position_size_percent: float = 0.1,
+        transaction_fee: float = 0.0001,
     ):
+        self.exchange = exchange
         self.population = initial_population
         self.agents: list[TradingAgent] = []
         self.generations = 100
         self.generation_lifespan = generation_lifespan
-        self.times = []
-
-        if interval == Interval.MINUTE:
-            self.times = np.arange(
-                datetime(2020, 1, 1),
-                datetime(2025, 1, 1),
-                datetime.timedelta(minutes=1),
-            ).astype(datetime)
-        elif interval == Interval.HOUR:
-            self.times = np.arange(
-                datetime(2020, 1, 1), datetime(2025, 1, 1), datetime.timedelta(hours=1)
-            ).astype(datetime)
-        elif interval == Interval.DAY:
-            self.times = np.arange(
-                datetime(2020, 1, 1),
-                datetime(2025, 1, 1),
-                datetime.timedelta(days=1),
-            ).astype(datetime)
-
-        np.arange(
-            datetime(2020, 1, 1), datetime(2025, 1, 1), datetime.timedelta(hours=1)
-        ).astype(datetime)
+        self.interval = interval
+        self.mutation_rate = mutation_rate
+        self.position_size_percent = position_size_percent
+        self.transaction_fee = transaction_fee
+
+        self.times = np.arange(
+            np.datetime64(datetime.datetime(2020, 1, 1)),
+            np.datetime64(datetime.datetime(2025, 1, 1)),
+            np.timedelta64(INTERVAL_TIMEDELTAS[interval]),
+        ).astype(datetime.datetime)
 
         self.create_initial_population()
 
@@ -52,45 +48,138 @@ class TradingSystem:
         for i in range(self.population):
             parameters.append(
                 {
-                    "alpha": random.random(),
-                    "beta": random.random(),
+                    "coeffs": [random.random(), random.random()],
                     "gamma": random.random(),
-                    "epsilon": random.random(),
+                    "threshold": random.random(),
                     "window_size": random.randint(2, 100),
                 }
             )
 
         strategies = [ExponentialDecayOHLCVStrategy(**param) for param in parameters]
         self.agents = [
-            TradingAgent(
-                name=f"agent_{i}",
-                strategy=strategy,
-                initial_capital=100,
-                position_size_percent=0.1,
-                min_trade_size=5,
-                transaction_fee=0.0001,
-            )
+            self.create_agent(f"agent_{i}", strategy)
             for i, strategy in enumerate(strategies)
         ]
 
+    def create_agent(
+        self, name: str, strategy: TradingStrategy, exchange: Exchange | None = None
+    ) -> TradingAgent:
+        """
+        Create an agent trading the given strategy with the system's settings.
+
+        Args:
+            name (str): the name of the agent.
+            strategy (TradingStrategy): the strategy of the agent.
+            exchange (Exchange): the exchange to trade on, defaults to the system's.
+
+        Returns: the agent.
+        """
+        return TradingAgent(
+            name=name,
+            exchange=exchange or self.exchange,
+            strategy=strategy,
+            initial_capital=100,
+            position_size_percent=self.position_size_percent,
+            min_trade_size=5,
+            transaction_fee=self.transaction_fee,
+        )
+
     def evaluate(self, start_time: datetime) -> None:
         """
         Evaluate the population.
         """
         # every generation, will live trade for 52 timesteps starting from start_time
-        timedelta = datetime.timedelta(hours=1)
-        if self.interval == Interval.MINUTE:
-            timedelta = datetime.timedelta(minutes=1)
-        elif self.interval == Interval.DAY:
-            timedelta = datetime.timedelta(days=1)
-
-        for _ in range(self.generation_lifespan):
-            time = start_time + timedelta
+        timedelta = INTERVAL_TIMEDELTAS[self.interval]
+
+        for step in range(self.generation_lifespan):
+            time = start_time + timedelta * (step + 1)
             for agent in self.agents:
                 agent.update(time, 100, self.interval)
 
+    def run(
+        self,
+        start_time: datetime,
+        generations: int,
+        first_generation: int = 0,
+        on_generation: Callable[[int], None] | None = None,
+    ) -> None:
+        """
+        Evaluate and evolve the population for a number of generations. Every
+        generation trades the ticks following the previous one.
+
+        Args:
+            start_time (datetime): the time the first generation starts from.
+            generations (int): the number of generations to run.
+            first_generation (int): the index of the first generation, when resuming.
+            on_generation (Callable[[int], None]): called with the generation index
+                after it was evaluated and before it is evolved.
+        """
+        timedelta = INTERVAL_TIMEDELTAS[self.interval]
+
+        for generation in range(first_generation, first_generation + generations):
+            self.evaluate(
+                start_time + timedelta * self.generation_lifespan * generation
+            )
+            if on_generation is not None:
+                on_generation(generation)
+            self.evolve()
+
+    def fitnesses(self) -> list[float]:
+        """
+        Get the fitness of every agent of the evaluated generation.
+
+        Returns: the fitness scores, in the order of the agents.
+        """
+        return [agent.fitness() for agent in self.agents]
+
     def evolve(self) -> None:
         """
         Evolve the population.
+
+        The fitter half of the population survives, and the rest of the next
+        generation is filled with mutated copies of the survivors.
         """
-        pass
+        fitnesses = self.fitnesses()
+        ranked = sorted(
+            range(len(self.agents)), key=lambda i: fitnesses[i], reverse=True
+        )
+        survivors = [
+            self.agents[i].strategy for i in ranked[: max(1, len(ranked) // 2)]
+        ]
+
+        strategies = list(survivors)
+        while len(strategies) < self.population:
+            child = copy.deepcopy(random.choice(survivors))
+            child.mutate(self.mutation_rate)
+            strategies.append(child)
+
+        self.agents = [
+            self.create_agent(f"agent_{i}", strategy)
+            for i, strategy in enumerate(strategies)
+        ]
+
+
+def create_system(config: RunConfig, exchange: Exchange) -> TradingSystem:
+    """
+    Create a trading system from a run configuration, seeding the random genomes
+    and mutations if the configuration has a seed.
+
+    Args:
+        config (RunConfig): the run configuration.
+        exchange (Exchange): the exchange over the configuration's data.
+
+    Returns: the trading system.
+    """
+    if config.seed is not None:
+        random.seed(config.seed)
+        np.random.seed(config.seed)
+
+    return TradingSystem(
+        exchange=exchange,
+        initial_population=config.initial_population,
+        generation_lifespan=config.generation_lifespan,
+        interval=Interval(config.interval),
+        mutation_rate=config.mutation_rate,
+        position_size_percent=config.position_size_percent,
+        transaction_fee=config.transaction_fee,
+    )
@@ -1,10 +1,47 @@
 import datetime
+import math
+from dataclasses import dataclass
 
 from src.exchange import Exchange, Interval
+from src.history import DecisionHistory
 from src.strategy import TradingStrategy
 
 
+@dataclass
+class AgentState:
+    """
+    The mutable trading state of an agent.
+
+    Args:
+        capital (float): the cash of the agent.
+        position (float): the quantity held, negative when short.
+        long_trades (int): the number of executed long trades.
+        short_trades (int): the number of executed short trades.
+        fitness (float): the fitness recorded by whoever evaluated the agent, nan
+            when the agent calculates it from its decisions.
+        max_drawdown (float): the max drawdown recorded like the fitness.
+    """
+
+    capital: float
+    position: float = 0
+    long_trades: int = 0
+    short_trades: int = 0
+    fitness: float = math.nan
+    max_drawdown: float = math.nan
+
+
 class TradingAgent:
+    """
+    An agent trading a strategy on an exchange.
+
+    The capital, position and trade counts live in the agent's state, an AgentState
+    by default. Any object with the same attributes can be passed instead, like a
+    row of a shared population, to keep the state outside of the agent. A passed
+    state is used as it is, the agent doesn't reset it. Once a fitness and max
+    drawdown are recorded in the state, the agent returns them instead of
+    calculating them from its own decisions.
+    """
+
     def __init__(
         self,
         name: str,
@@ -14,18 +51,55 @@ class TradingAgent:
         position_size_percent=0.1,
         min_trade_size=1,
         transaction_fee=0.001,
+        history_size: int | None = None,
+        spill_dir: str | None = None,
+        state: AgentState | None = None,
     ):
+        self.state = state if state is not None else AgentState(initial_capital)
         self.name = name
         self.strategy = strategy
-        self.capital = initial_capital
         self.initial_capital = initial_capital
         self.position_size_percent = position_size_percent
-        self.position = 0
         self.transaction_fee = transaction_fee
         self.min_trade_size = min_trade_size
         self.exchange = exchange
-        self.decisions = []
-        self.max_position_value = self.capital * self.position_size_percent
+        # without a history size every decision is kept in memory
+        self.decisions = (
+            DecisionHistory(history_size, spill_dir) if history_size else []
+        )
+        self.max_position_value = initial_capital * self.position_size_percent
+
+    @property
+    def capital(self) -> float:
+        return self.state.capital
+
+    @capital.setter
+    def capital(self, value: float) -> None:
+        self.state.capital = value
+
+    @property
+    def position(self) -> float:
+        return self.state.position
+
+    @position.setter
+    def position(self, value: float) -> None:
+        self.state.position = value
+
+    @property
+    def long_trades(self) -> int:
+        return self.state.long_trades
+
+    @long_trades.setter
+    def long_trades(self, value: int) -> None:
+        self.state.long_trades = value
+
+    @property
+    def short_trades(self) -> int:
+        return self.state.short_trades
+
+    @short_trades.setter
+    def short_trades(self, value: int) -> None:
+        self.state.short_trades = value
 
     def update(self, now: datetime, max_history_count: int, interval: Interval) -> None:
         """
@@ -61,6 +135,11 @@ class TradingAgent:
             fee = trade_value * self.transaction_fee
             self.capital -= trade_value + fee
             self.position += quantity
+            # the confidence is signed, so the quantity's sign isn't the signal's
+            if signal == "long":
+                self.long_trades += 1
+            else:
+                self.short_trades += 1
 
         self.decisions.append(
             {
@@ -77,16 +156,27 @@ class TradingAgent:
 
         Returns: the maximum drawdown as a percentage.
         """
+        if not math.isnan(self.state.max_drawdown):
+            return self.state.max_drawdown
+
         if not self.decisions:
             return 0.0
 
-        # Calculate portfolio values over time
-        portfolio_values = []
+        if len(self.decisions) < 2:
+            return 0.0
+
+        # Sort decisions by timestamp, a decision history is appended in order and
+        # is streamed from disk instead
+        if isinstance(self.decisions, DecisionHistory):
+            sorted_decisions = self.decisions
+        else:
+            sorted_decisions = sorted(self.decisions, key=lambda x: x["timestamp"])
+
+        # Calculate portfolio values over time with their running maximum
         current_position = 0
         current_capital = self.initial_capital
-
-        # Sort decisions by timestamp
-        sorted_decisions = sorted(self.decisions, key=lambda x: x["timestamp"])
+        running_max = float("-inf")
+        max_drawdown = 0.0
 
         for decision in sorted_decisions:
             price = decision["price"]
@@ -94,17 +184,8 @@ class TradingAgent:
 
             current_position += quantity
             current_capital -= price * quantity
-            portfolio_value = current_capital + (current_position * price)
-            portfolio_values.append(portfolio_value)
+            value = current_capital + (current_position * price)
 
-        if len(portfolio_values) < 2:
-            return 0.0
-
-        # Calculate running maximum
-        running_max = float("-inf")
-        max_drawdown = 0.0
-
-        for value in portfolio_values:
             if value > running_max:
                 running_max = value
 
@@ -113,19 +194,22 @@ class TradingAgent:
 
         return float(max_drawdown)
 
-    def fitness(self) -> None:
+    def fitness(self) -> float:
         """
         Calculate a simple fitness score based on final portfolio value and drawdown.
         Higher score is better.
 
         Returns: the fitness score.
         """
-        if not self.trades:
+        if not math.isnan(self.state.fitness):
+            return self.state.fitness
+
+        if not self.decisions:
             return 0.0
 
         # Calculate final portfolio value
-        final_position = sum(trade["quantity"] for trade in self.trades)
-        final_price = self.trades[-1]["price"]
+        final_position = self.position
+        final_price = self.decisions[-1]["price"]
 
         portfolio_value = self.capital + (final_position * final_price)
         profit_factor = portfolio_value / self.initial_capital
@@ -0,0 +1,119 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.cli import main
+from src.config import RunConfig
+from src.differential import random_ohlcv_frame
+
+
+class RunConfigTestCase(unittest.TestCase):
+    def test_defaults(self):
+        config = RunConfig.from_dict({"data_path": "data.csv"})
+
+        self.assertEqual(config.interval, "hour")
+        self.assertEqual(config.to_dict()["data_path"], "data.csv")
+
+    def test_rejects_unknown_keys(self):
+        with self.assertRaises(ValueError):
+            RunConfig.from_dict({"data_path": "data.csv", "population": 10})
+
+    def test_rejects_invalid_values(self):
+        with self.assertRaises(ValueError):
+            RunConfig.from_dict({"data_path": "data.csv", "interval": "week"})
+        with self.assertRaises(ValueError):
+            RunConfig.from_dict({"data_path": "data.csv", "generations": 0})
+
+    def test_requires_data_path(self):
+        with self.assertRaises(ValueError):
+            RunConfig.from_dict({})
+
+
+class CliTestCase(unittest.TestCase):
+    def test_help_does_not_import_heavy_modules(self):
+        code = (
+            "import sys\n"
+            "from src.cli import create_parser\n"
+            "create_parser().format_help()\n"
+            "print(any(name in sys.modules for name in ('pandas', 'numpy')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_run_check_validates_config(self):
+        with tempfile.TemporaryDirectory() as directory:
+            valid = os.path.join(directory, "valid.json")
+            with open(valid, "w") as file:
+                json.dump({"data_path": "data.csv"}, file)
+            invalid = os.path.join(directory, "invalid.json")
+            with open(invalid, "w") as file:
+                json.dump({"data_path": "data.csv", "interval": "week"}, file)
+
+            self.assertEqual(main(["run", valid, "--check"]), 0)
+            self.assertEqual(main(["run", invalid, "--check"]), 1)
+
+    def test_convert_data_rejects_unsupported_destination(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "data.csv")
+            with open(source, "w") as file:
+                file.write("timestamp,Open,High,Low,Close,Volume\n")
+                file.write("2021-01-01 00:00:00,1,2,0.5,1.5,10\n")
+
+            destination = os.path.join(directory, "data.parquet")
+
+            self.assertEqual(main(["convert-data", source, destination]), 1)
+            self.assertEqual(
+                main(["convert-data", source, os.path.join(directory, "out.csv")]), 0
+            )
+
+    def test_resume_continues_like_an_uninterrupted_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            data_path = os.path.join(directory, "data.csv")
+            random_ohlcv_frame(np.random.default_rng(0), 24 * 10).to_csv(
+                data_path, index=False
+            )
+            config_path = os.path.join(directory, "config.json")
+            config = {
+                "data_path": data_path,
+                "initial_population": 4,
+                "generation_lifespan": 12,
+                "generations": 2,
+                "start_time": "2021-01-05 00:00:00",
+                "seed": 7,
+            }
+            with open(config_path, "w") as file:
+                json.dump(config, file)
+            uninterrupted = os.path.join(directory, "uninterrupted.json")
+            self.assertEqual(
+                main(["run", config_path, "--checkpoint", uninterrupted]), 0
+            )
+
+            with open(config_path, "w") as file:
+                json.dump(dict(config, generations=1), file)
+            interrupted = os.path.join(directory, "interrupted.json")
+            self.assertEqual(main(["run", config_path, "--checkpoint", interrupted]), 0)
+            with open(interrupted) as file:
+                checkpoint = json.load(file)
+            checkpoint["config"]["generations"] = 2
+            with open(interrupted, "w") as file:
+                json.dump(checkpoint, file)
+            self.assertEqual(main(["resume", interrupted]), 0)
+
+            with open(uninterrupted) as file:
+                expected = json.load(file)
+            with open(interrupted) as file:
+                resumed = json.load(file)
+            self.assertEqual(resumed["generation"], 2)
+            self.assertEqual(resumed["strategies"], expected["strategies"])
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                ["config.json", "data.csv", "interrupted.json", "uninterrupted.json"],
+            )
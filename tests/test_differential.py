@@ -0,0 +1,141 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.differential import (
+    CURRENT_ENGINE,
+    EDGE_CASES,
+    Engine,
+    ReferenceStrategy,
+    assert_engines_match,
+    compare_traces,
+    random_genome,
+    random_ohlcv_frame,
+    reference_inter_norm,
+    reference_intra_norm,
+    run_engine,
+)
+from src.exchange import LocalBTCExchange, Precision
+from src.norm import InterNormCalculator, IntraNormCalculator
+from src.strategy import ExponentialDecayOHLCVStrategy
+from src.trading_agent import TradingAgent
+
+
+class DifferentialTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.frames = [random_ohlcv_frame(rng, 120) for _ in range(3)]
+        self.edge_frames = [random_ohlcv_frame(rng, 120, case) for case in EDGE_CASES]
+        self.genomes = [random_genome(rng) for _ in range(4)]
+        self.genomes.append(dict(random_genome(rng), window_size=1))
+
+    def test_norm_calculators_match_reference(self):
+        for frame in self.frames + self.edge_frames:
+            for size in (1, 2, 17, 120):
+                window = frame.tail(size)
+                np.testing.assert_equal(
+                    IntraNormCalculator().calculate(window),
+                    reference_intra_norm(window),
+                )
+                np.testing.assert_equal(
+                    InterNormCalculator().calculate(window),
+                    reference_inter_norm(window),
+                )
+
+    def test_batch_decisions_match_reference(self):
+        for frame in self.frames + self.edge_frames:
+            exchange = LocalBTCExchange.from_frame(frame)
+            for genome in self.genomes:
+                timestamps, windows = exchange.get_market_windows(
+                    frame["timestamp"].iloc[0],
+                    frame["timestamp"].iloc[-1],
+                    genome["window_size"],
+                )
+                actions, confidences = ExponentialDecayOHLCVStrategy.from_dict(
+                    genome
+                ).decide_batch(windows)
+
+                reference = ReferenceStrategy(genome)
+                for timestamp, action, confidence in zip(
+                    timestamps, actions, confidences
+                ):
+                    expected_action, expected_confidence, _ = reference.decide(
+                        exchange.get_market_data(timestamp, 100)
+                    )
+                    self.assertEqual(action, expected_action)
+                    np.testing.assert_allclose(
+                        confidence, expected_confidence, rtol=1e-9, atol=1e-12
+                    )
+
+    def test_current_engine_matches_reference(self):
+        assert_engines_match(
+            CURRENT_ENGINE, self.frames + self.edge_frames, self.genomes, ticks=30
+        )
+
+    def test_spilled_decision_history_matches_reference(self):
+        engine = Engine(
+            "history",
+            LocalBTCExchange.from_frame,
+            ExponentialDecayOHLCVStrategy.from_dict,
+            lambda **kwargs: TradingAgent(name="history", history_size=4, **kwargs),
+        )
+
+        assert_engines_match(engine, self.frames, self.genomes, ticks=30)
+
+    def test_compact_precisions_match_reference_within_tolerance(self):
+        for precision in (Precision.FLOAT32, Precision.FIXED):
+            engine = Engine(
+                precision.value,
+                lambda frame, precision=precision: LocalBTCExchange.from_frame(
+                    frame, precision
+                ),
+                ExponentialDecayOHLCVStrategy.from_dict,
+                lambda precision=precision, **kwargs: TradingAgent(
+                    name=precision.value, **kwargs
+                ),
+            )
+
+            assert_engines_match(
+                engine, self.frames, self.genomes, ticks=30, rtol=1e-3, atol=1e-4
+            )
+
+    def test_detects_drift(self):
+        class DriftedStrategy(ReferenceStrategy):
+            # widens every candle, like an optimized path with drifting norm math
+            def decide(self, market_data):
+                market_data = market_data.assign(
+                    High=market_data["High"] + 1e-3 * market_data["Close"]
+                )
+                return super().decide(market_data)
+
+        engine = Engine(
+            "drifted",
+            LocalBTCExchange.from_frame,
+            DriftedStrategy,
+            lambda **kwargs: TradingAgent(name="drifted", **kwargs),
+        )
+
+        with self.assertRaises(AssertionError):
+            assert_engines_match(engine, self.frames, self.genomes, ticks=30)
+
+    def test_action_flip_at_threshold_is_tolerated(self):
+        frame = self.frames[0]
+        genome = self.genomes[0]
+        reference = run_engine(CURRENT_ENGINE, frame, genome, ticks=5)
+        candidate = run_engine(CURRENT_ENGINE, frame, genome, ticks=5)
+        reference.confidences[2] = candidate.confidences[2] = genome["threshold"]
+        reference.actions[2] = "hold"
+        candidate.actions[2] = "long"
+        candidate.capital += 1
+
+        self.assertEqual(compare_traces(reference, candidate, genome["threshold"]), [])
+
+    def test_traces_cover_every_tick(self):
+        trace = run_engine(CURRENT_ENGINE, self.frames[0], self.genomes[0], ticks=10)
+
+        self.assertEqual(len(trace.actions), 10)
+        self.assertEqual(len(trace.quantities), 10)
+        self.assertIsInstance(trace.fitness, float)
+        self.assertTrue(set(trace.actions) <= {"long", "short", "hold"})
+        self.assertFalse(pd.isna(trace.capital))
@@ -1,6 +1,10 @@
 import unittest
+from datetime import datetime
 
-from src.exchange import LocalBTCExchange
+import numpy as np
+import pandas as pd
+
+from src.exchange import Interval, LocalBTCExchange, Precision
 
 
 class LocalBTCExchangeTestCase(unittest.TestCase):
@@ -14,3 +18,144 @@ class LocalBTCExchangeTestCase(unittest.TestCase):
         self.assertEqual(market_data.shape, (100, 6))
         self.assertEqual(market_data.iloc[0]["Open"], 26202.37)
         self.assertEqual(market_data.iloc[-1]["Close"], 29066.58)
+
+
+class LocalBTCExchangeResampleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.exchange = LocalBTCExchange.from_frame(
+            pd.DataFrame(
+                {
+                    "timestamp": pd.date_range("2021-01-01", periods=48, freq="h"),
+                    "Open": np.arange(48.0),
+                    "High": np.arange(48.0) + 2,
+                    "Low": np.arange(48.0) - 1,
+                    "Close": np.arange(48.0) + 1,
+                    "Volume": np.ones(48),
+                }
+            )
+        )
+
+    def test_resample_to_daily_candles(self):
+        daily = self.exchange.resample(Interval.DAY)
+
+        self.assertEqual(len(daily.market_data), 2)
+        self.assertEqual(daily.market_data.iloc[1]["Open"], 24.0)
+        self.assertEqual(daily.market_data.iloc[1]["High"], 49.0)
+        self.assertEqual(daily.market_data.iloc[1]["Low"], 23.0)
+        self.assertEqual(daily.market_data.iloc[1]["Close"], 48.0)
+        self.assertEqual(daily.market_data.iloc[1]["Volume"], 24.0)
+        self.assertEqual(daily.get_current_price(datetime(2021, 1, 2)), 48.0)
+
+    def test_subsample_keeps_every_step_candle(self):
+        subsampled = self.exchange.subsample(6)
+
+        self.assertEqual(len(subsampled.market_data), 8)
+        self.assertEqual(subsampled.get_current_price(datetime(2021, 1, 1, 6)), 7.0)
+
+
+class LocalBTCExchangePrecisionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.market_data = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2021-01-01", periods=4, freq="h"),
+                "Open": [29000.5, 29001.25, 29002.0, 29003.75],
+                "High": [29010.5, 29011.25, 29012.0, 29013.75],
+                "Low": [28990.5, 28991.25, 28992.0, 28993.75],
+                "Close": [29001.25, 29002.0, 29003.75, 29004.5],
+                "Volume": [1.5, 2.5, 3.5, 4.5],
+            }
+        )
+
+    def test_float32(self):
+        exchange = LocalBTCExchange.from_frame(self.market_data, Precision.FLOAT32)
+
+        self.assertEqual(exchange.market_data["Close"].dtype, np.float32)
+        self.assertEqual(exchange.get_current_price(datetime(2021, 1, 1, 1)), 29002.0)
+        self.assertLess(
+            exchange.memory_usage(),
+            LocalBTCExchange.from_frame(self.market_data).memory_usage(),
+        )
+
+    def test_fixed_point(self):
+        exchange = LocalBTCExchange.from_frame(self.market_data, Precision.FIXED)
+
+        self.assertEqual(exchange.market_data["Close"].dtype, np.int32)
+        self.assertEqual(exchange.price_scale, 10**4)
+        self.assertEqual(exchange.market_data.iloc[0]["Open"], 290005000)
+        self.assertEqual(exchange.get_current_price(datetime(2021, 1, 1, 3)), 29004.5)
+
+    def test_fixed_point_resample_keeps_scale(self):
+        exchange = LocalBTCExchange.from_frame(self.market_data, Precision.FIXED)
+
+        daily = exchange.resample(Interval.DAY)
+
+        self.assertEqual(daily.price_scale, exchange.price_scale)
+        self.assertEqual(daily.market_data["High"].dtype, np.int32)
+        self.assertEqual(daily.get_current_price(datetime(2021, 1, 1)), 29004.5)
+
+    def test_get_market_data_up_to_now(self):
+        exchange = LocalBTCExchange.from_frame(self.market_data.iloc[::-1])
+
+        market_data = exchange.get_market_data("2021-01-01 02:30:00", 2)
+
+        self.assertEqual(list(market_data["Open"]), [29001.25, 29002.0])
+
+    def test_get_current_price_without_candle(self):
+        exchange = LocalBTCExchange.from_frame(self.market_data)
+
+        with self.assertRaises(IndexError):
+            exchange.get_current_price(datetime(2021, 1, 1, 0, 30))
+
+
+class LocalBTCExchangeWindowsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.exchange = LocalBTCExchange.from_frame(
+            pd.DataFrame(
+                {
+                    "timestamp": pd.date_range("2021-01-01", periods=10, freq="h"),
+                    "Open": np.arange(10.0),
+                    "High": np.arange(10.0) + 2,
+                    "Low": np.arange(10.0) - 1,
+                    "Close": np.arange(10.0) + 1,
+                    "Volume": np.arange(10.0) * 10,
+                }
+            )
+        )
+
+    def test_windows_match_market_data(self):
+        timestamps, windows = self.exchange.get_market_windows(
+            datetime(2021, 1, 1, 4), datetime(2021, 1, 1, 7), 3
+        )
+
+        self.assertEqual(windows.shape, (4, 3, 5))
+        self.assertEqual(timestamps[0], np.datetime64("2021-01-01T04:00"))
+        for timestamp, window in zip(timestamps, windows):
+            market_data = self.exchange.get_market_data(timestamp, 3)
+            np.testing.assert_array_equal(
+                window, market_data[["Open", "High", "Low", "Close", "Volume"]]
+            )
+
+    def test_windows_are_views(self):
+        _, windows = self.exchange.get_market_windows(
+            datetime(2021, 1, 1), datetime(2021, 1, 1, 9), 4
+        )
+
+        self.assertEqual(windows.shape, (7, 4, 5))
+        self.assertTrue(np.shares_memory(windows, self.exchange._ohlcv))
+        self.assertFalse(windows.flags.writeable)
+
+    def test_windows_outside_market_data(self):
+        timestamps, windows = self.exchange.get_market_windows(
+            datetime(2022, 1, 1), datetime(2022, 1, 2), 4
+        )
+
+        self.assertEqual(len(timestamps), 0)
+        self.assertEqual(windows.shape, (0, 4, 5))
+
+    def test_window_longer_than_market_data(self):
+        timestamps, windows = self.exchange.get_market_windows(
+            datetime(2021, 1, 1), datetime(2021, 1, 1, 9), 11
+        )
+
+        self.assertEqual(len(timestamps), 0)
+        self.assertEqual(windows.shape, (0, 11, 5))
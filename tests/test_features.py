@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.features import FeatureStore
+
+
+def create_market_data():
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2021-01-01", periods=5, freq="h"),
+            "Open": [1, 2, 3, 4, 5],
+            "High": [2, 3, 4, 5, 6],
+            "Low": [0, 1, 2, 3, 4],
+            "Close": [2, 3, 4, 5, 6],
+            "Volume": [1, 2, 3, 4, 5],
+            "rsi": [10.0, 20.0, 30.0, 40.0, 50.0],
+            "macd": [-1.0, -0.5, 0.0, 0.5, 1.0],
+        }
+    )
+
+
+class FeatureStoreTestCase(unittest.TestCase):
+    def test_feature_columns(self):
+        store = FeatureStore.from_frame(create_market_data())
+
+        self.assertEqual(store.columns, ["rsi", "macd"])
+        self.assertEqual(store.features.dtype, np.float32)
+        self.assertTrue(store.features.flags["C_CONTIGUOUS"])
+        self.assertEqual(len(store), 5)
+
+    def test_position(self):
+        store = FeatureStore.from_frame(create_market_data())
+
+        self.assertEqual(store.position("2021-01-01 02:00:00"), 2)
+        self.assertEqual(store.position("2021-01-01 02:30:00"), 2)
+        self.assertEqual(store.position("2020-12-31 23:00:00"), -1)
+
+    def test_window(self):
+        store = FeatureStore.from_frame(create_market_data())
+
+        window = store.window(3, 2)
+
+        self.assertEqual(window.tolist(), [[30.0, 0.0], [40.0, 0.5]])
+        self.assertTrue(np.shares_memory(window, store.features))
+        self.assertEqual(store.column_window("rsi", 1, 10).tolist(), [10.0, 20.0])
+
+    def test_cache_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "enriched.csv")
+            cache_dir = os.path.join(directory, "cache")
+            create_market_data().to_csv(path, index=False)
+
+            FeatureStore(path, cache_dir=cache_dir)
+            store = FeatureStore(path, cache_dir=cache_dir)
+
+            self.assertIsInstance(store.features, np.memmap)
+            self.assertEqual(store.columns, ["rsi", "macd"])
+            self.assertEqual(store.position("2021-01-01 04:00:00"), 4)
+
+            store = FeatureStore(path, columns=["macd"], cache_dir=cache_dir)
+
+            self.assertNotIsInstance(store.features, np.memmap)
+            self.assertEqual(store.columns, ["macd"])
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.history import DecisionHistory
+
+
+class DecisionHistoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.base_date = datetime(2024, 1, 1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_history(self, count, hot_size=4, segment_size=None):
+        history = DecisionHistory(hot_size, self.directory.name, segment_size)
+        for i in range(count):
+            history.append(
+                {
+                    "timestamp": self.base_date + timedelta(hours=i),
+                    "price": 100.0 + i,
+                    "quantity": float(i % 3 - 1),
+                }
+            )
+        return history
+
+    def test_keeps_everything_hot_below_hot_size(self):
+        history = self.create_history(3)
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(os.listdir(self.directory.name), [])
+        self.assertIsNone(history.spill_dir)
+        self.assertEqual([decision["price"] for decision in history], [100, 101, 102])
+
+    def test_spills_oldest_segments(self):
+        history = self.create_history(11, hot_size=4, segment_size=2)
+
+        self.assertEqual(len(history), 11)
+        self.assertEqual(
+            os.listdir(self.directory.name), [os.path.basename(history.spill_dir)]
+        )
+        self.assertEqual(len(os.listdir(history.spill_dir)), 4)
+        self.assertEqual(
+            [decision["price"] for decision in history],
+            [100.0 + i for i in range(11)],
+        )
+
+    def test_getitem_reads_hot_and_spilled_decisions(self):
+        history = self.create_history(10, hot_size=4)
+
+        self.assertEqual(history[0]["price"], 100.0)
+        self.assertEqual(history[5]["timestamp"], self.base_date + timedelta(hours=5))
+        self.assertEqual(history[-1]["price"], 109.0)
+        self.assertEqual(history[-1]["quantity"], -1.0)
+        with self.assertRaises(IndexError):
+            history[10]
+
+    def test_to_array(self):
+        history = self.create_history(9, hot_size=4, segment_size=3)
+
+        array = history.to_array()
+
+        self.assertEqual(len(array), 9)
+        self.assertEqual(list(array["price"]), [100.0 + i for i in range(9)])
+
+    def test_temporary_spill_dir_is_removed(self):
+        history = DecisionHistory(hot_size=1)
+        for i in range(3):
+            history.append({"timestamp": self.base_date, "price": 1.0, "quantity": 0.0})
+        spill_dir = history.spill_dir
+
+        self.assertTrue(os.listdir(spill_dir))
+
+        del history
+
+        self.assertFalse(os.path.exists(spill_dir))
+
+    def test_histories_spill_to_their_own_directories(self):
+        first = self.create_history(6)
+        second = self.create_history(6)
+
+        self.assertNotEqual(first.spill_dir, second.spill_dir)
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+        del first, second
+
+        self.assertEqual(os.listdir(self.directory.name), [])
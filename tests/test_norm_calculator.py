@@ -2,7 +2,8 @@ import unittest
 
 import pandas as pd
 
-from src.norm import InterNormCalculator, IntraNormCalculator
+from src.features import FeatureStore
+from src.norm import FeatureNormCalculator, InterNormCalculator, IntraNormCalculator
 
 
 class IntraNormCalculatorTestCase(unittest.TestCase):
@@ -39,3 +40,27 @@ class InterNormCalculatorTestCase(unittest.TestCase):
         norm = inter_norm_calculator.calculate(market_data)
 
         self.assertEqual(norm, 0.3333333333333333)
+
+
+class FeatureNormCalculatorTestCase(unittest.TestCase):
+    def test_norms(self):
+        store = FeatureStore.from_frame(
+            pd.DataFrame(
+                {
+                    "timestamp": pd.date_range("2021-01-01", periods=5, freq="h"),
+                    "rsi": [10.0, 20.0, 30.0, 40.0, 50.0],
+                }
+            )
+        )
+        feature_norm_calculator = FeatureNormCalculator(store, "rsi")
+
+        market_data = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2021-01-01 01:00", periods=3, freq="h"),
+                "Close": [3, 4, 5],
+            }
+        )
+
+        norm = feature_norm_calculator.calculate(market_data)
+
+        self.assertEqual(norm, 30.0)
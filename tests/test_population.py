@@ -0,0 +1,149 @@
+import random
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from src.differential import random_ohlcv_frame
+from src.exchange import Interval, LocalBTCExchange
+from src.population import ParallelTradingSystem, PopulationRow, SharedPopulation
+from src.system import TradingSystem
+from src.trading_agent import AgentState, TradingAgent
+
+GENOME = {
+    "type": "exponential_decay_ohlcv",
+    "coeffs": [0.25, 0.75],
+    "gamma": 0.5,
+    "threshold": 0.1,
+    "window_size": 12,
+}
+
+
+class SharedPopulationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.shared, self.block = SharedPopulation.create(size=3, coeffs=2)
+        self.arrays = self.shared.arrays(self.block)
+
+    def tearDown(self):
+        del self.arrays
+        self.block.close()
+        self.block.unlink()
+
+    def test_reset_and_genome(self):
+        row = PopulationRow(self.arrays, 1)
+
+        row.reset(GENOME, 100)
+
+        self.assertEqual(row.genome(), GENOME)
+        self.assertEqual(row.capital, 100)
+        self.assertEqual(row.position, 0)
+        self.assertTrue(np.isnan(row.fitness))
+        self.assertEqual(self.arrays["capital"].tolist()[1], 100)
+
+    def test_attached_arrays_share_the_block(self):
+        attached, attached_block = self.shared.attach()
+        try:
+            PopulationRow(attached, 2).capital = 42.0
+
+            self.assertEqual(PopulationRow(self.arrays, 2).capital, 42.0)
+        finally:
+            del attached
+            attached_block.close()
+
+    def test_agent_trades_on_its_row(self):
+        row = PopulationRow(self.arrays, 0)
+        row.reset(GENOME, 1000)
+        exchange = Mock()
+        exchange.get_current_price.return_value = 60000
+        strategy = Mock()
+        strategy.decide.return_value = "long", 1.0, {}
+
+        agent = TradingAgent(
+            name="test",
+            strategy=strategy,
+            exchange=exchange,
+            initial_capital=1000,
+            state=row,
+        )
+        agent.update("2021-01-01 00:00:00", 100, Interval.HOUR)
+
+        self.assertEqual(row.capital, 899.9)
+        self.assertEqual(row.position, 0.0016666666666666668)
+        self.assertEqual(row.long_trades, 1)
+        self.assertEqual(agent.capital, row.capital)
+
+    def test_agent_does_not_reset_its_row(self):
+        row = PopulationRow(self.arrays, 0)
+        row.reset(GENOME, 1000)
+        row.capital = 900.0
+        row.position = 2.0
+        row.short_trades = 3
+
+        agent = TradingAgent(
+            name="test",
+            strategy=Mock(),
+            exchange=Mock(),
+            initial_capital=1000,
+            state=row,
+        )
+
+        self.assertEqual(agent.capital, 900.0)
+        self.assertEqual(agent.position, 2.0)
+        self.assertEqual(agent.short_trades, 3)
+
+
+class ParallelTradingSystemTestCase(unittest.TestCase):
+    def create(self, cls, **kwargs):
+        random.seed(3)
+        return cls(
+            exchange=LocalBTCExchange.from_frame(
+                random_ohlcv_frame(np.random.default_rng(0), 24 * 20)
+            ),
+            initial_population=6,
+            generation_lifespan=12,
+            interval=Interval.HOUR,
+            **kwargs,
+        )
+
+    def test_matches_serial_system(self):
+        serial = self.create(TradingSystem)
+        start_time = pd.Timestamp("2021-01-05 00:00:00")
+
+        with self.create(ParallelTradingSystem, max_workers=2) as parallel:
+            for generation in range(2):
+                time = start_time + pd.Timedelta(hours=12 * generation)
+                serial.evaluate(time)
+                parallel.evaluate(time)
+
+                self.assertEqual(parallel.fitnesses(), serial.fitnesses())
+                self.assertEqual(
+                    [agent.fitness() for agent in parallel.agents],
+                    serial.fitnesses(),
+                )
+                self.assertEqual(
+                    [agent.calculate_max_drawdown() for agent in parallel.agents],
+                    [agent.calculate_max_drawdown() for agent in serial.agents],
+                )
+                self.assertEqual(
+                    [agent.capital for agent in parallel.agents],
+                    [agent.capital for agent in serial.agents],
+                )
+
+                for system in (serial, parallel):
+                    random.seed(generation)
+                    np.random.seed(generation)
+                    system.evolve()
+
+                self.assertEqual(
+                    [agent.strategy.to_dict() for agent in parallel.agents],
+                    [agent.strategy.to_dict() for agent in serial.agents],
+                )
+
+            parallel.evaluate(start_time)
+            capital = parallel.agents[0].capital
+            fitness = parallel.fitnesses()[0]
+
+        self.assertIsInstance(parallel.agents[0].state, AgentState)
+        self.assertEqual(parallel.agents[0].capital, capital)
+        self.assertEqual(parallel.agents[0].fitness(), fitness)
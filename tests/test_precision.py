@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.exchange import LocalBTCExchange, Precision
+from src.precision import compare_decisions
+from src.strategy import ExponentialDecayOHLCVStrategy
+
+
+class CompareDecisionsTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        close = 30000 + np.cumsum(rng.normal(0, 50, 300))
+        open_ = np.concatenate([[30000], close[:-1]])
+        self.market_data = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2021-01-01", periods=300, freq="h"),
+                "Open": open_,
+                "High": np.maximum(open_, close) + 10,
+                "Low": np.minimum(open_, close) - 10,
+                "Close": close,
+                "Volume": rng.uniform(1, 10, 300),
+            }
+        )
+        self.strategies = [
+            ExponentialDecayOHLCVStrategy(
+                coeffs=[rng.uniform(-1, 1), rng.uniform(-1, 1)],
+                gamma=rng.uniform(0, 1),
+                window_size=int(rng.integers(2, 50)),
+                threshold=rng.uniform(0, 0.5),
+            )
+            for _ in range(5)
+        ]
+        self.times = list(self.market_data["timestamp"].iloc[100::10])
+
+    def test_identical_exchanges(self):
+        exchange = LocalBTCExchange.from_frame(self.market_data)
+
+        report = compare_decisions(exchange, exchange, self.strategies, self.times)
+
+        self.assertEqual(report.decisions, 100)
+        self.assertEqual(report.action_agreement, 1.0)
+        self.assertEqual(report.max_confidence_error, 0.0)
+
+    def test_compact_precisions_follow_float64(self):
+        reference = LocalBTCExchange.from_frame(self.market_data)
+
+        for precision in (Precision.FLOAT32, Precision.FIXED):
+            candidate = LocalBTCExchange.from_frame(self.market_data, precision)
+
+            report = compare_decisions(
+                reference, candidate, self.strategies, self.times
+            )
+
+            self.assertLess(report.max_confidence_error, 1e-3)
+            self.assertLess(report.candidate_bytes, report.reference_bytes)
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from src.results import GenerationRecord, ResultsSink, ResultsStore
+
+
+def create_agent(name, fitness):
+    agent = Mock()
+    agent.name = name
+    agent.strategy.to_dict.return_value = {"type": "mock", "fitness": fitness}
+    agent.fitness.return_value = fitness
+    agent.calculate_max_drawdown.return_value = 0.1
+    agent.long_trades = 2
+    agent.short_trades = 1
+    agent.capital = 100.0
+    return agent
+
+
+class ResultsStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_best_genomes_across_runs(self):
+        store = ResultsStore(self.path)
+        store.append(
+            [
+                GenerationRecord.from_agent("a", 0, create_agent("agent_0", 0.5)),
+                GenerationRecord.from_agent("a", 0, create_agent("agent_1", 1.5)),
+                GenerationRecord.from_agent("b", 0, create_agent("agent_0", 1.0)),
+            ]
+        )
+
+        best = store.best_genomes(limit=2)
+        store.close()
+
+        self.assertEqual([record["fitness"] for record in best], [1.5, 1.0])
+        self.assertEqual(best[0]["genome"], {"type": "mock", "fitness": 1.5})
+        self.assertEqual(best[0]["run_id"], "a")
+        self.assertEqual(best[0]["long_trades"], 2)
+
+    def test_best_genomes_of_one_run(self):
+        store = ResultsStore(self.path)
+        store.append(
+            [
+                GenerationRecord.from_agent("a", 0, create_agent("agent_0", 0.5)),
+                GenerationRecord.from_agent("b", 0, create_agent("agent_0", 1.0)),
+            ]
+        )
+
+        best = store.best_genomes(run_id="a")
+        store.close()
+
+        self.assertEqual([record["fitness"] for record in best], [0.5])
+
+
+class ResultsSinkTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_buffers_until_batch_size(self):
+        sink = ResultsSink(self.path, "run", batch_size=3)
+        sink.record_generation(0, [create_agent("agent_0", 1.0)])
+        sink.record_generation(1, [create_agent("agent_0", 2.0)])
+
+        self.assertEqual(len(sink.buffer), 2)
+
+        sink.record_generation(2, [create_agent("agent_0", 3.0)])
+
+        self.assertEqual(sink.buffer, [])
+        sink.close()
+
+    def test_close_writes_everything(self):
+        sink = ResultsSink(self.path, "run", batch_size=2)
+        for generation in range(5):
+            sink.record_generation(
+                generation,
+                [create_agent(f"agent_{i}", generation + i) for i in range(3)],
+            )
+        sink.close()
+
+        store = ResultsStore(self.path)
+        best = store.best_genomes(limit=100)
+        store.close()
+
+        self.assertEqual(len(best), 15)
+        self.assertEqual(best[0]["generation"], 4)
+        self.assertEqual(best[0]["agent"], "agent_2")
+
+    def test_unopenable_database_raises_on_close(self):
+        path = os.path.join(self.directory.name, "missing", "results.sqlite")
+        sink = ResultsSink(path, "run")
+        sink.record_generation(0, [create_agent("agent_0", 1.0)])
+
+        with self.assertRaises(RuntimeError):
+            sink.close()
+        self.assertFalse(sink._writer.is_alive())
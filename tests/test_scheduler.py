@@ -0,0 +1,149 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+import numpy as np
+
+from src.exchange import Interval
+from src.scheduler import RealtimeScheduler, TickReport
+
+
+class SleepingAgent:
+    def __init__(self, name, duration, capital=100):
+        self.name = name
+        self.duration = duration
+        self.capital = capital
+        self.updates = []
+        self.lock = threading.Lock()
+
+    def update(self, now, max_history_count, interval):
+        time.sleep(self.duration)
+        with self.lock:
+            self.updates.append(now)
+
+    def fitness(self):
+        return -self.capital
+
+
+class FailingAgent(SleepingAgent):
+    def update(self, now, max_history_count, interval):
+        time.sleep(self.duration)
+        raise ValueError("update failed")
+
+
+class TickReportTestCase(unittest.TestCase):
+    def test_percentiles(self):
+        report = TickReport(
+            now=datetime(2021, 1, 1),
+            budget=1.0,
+            latencies={f"agent_{i}": i / 100 for i in range(101)},
+        )
+
+        self.assertAlmostEqual(report.p50, 0.5)
+        self.assertAlmostEqual(report.p99, 0.99)
+        self.assertAlmostEqual(report.worst, 1.0)
+
+    def test_percentiles_include_late_latencies(self):
+        report = TickReport(
+            now=datetime(2021, 1, 1), budget=1.0, latencies={"fast": 0.5}
+        )
+        report.record_late("slow", 2.0)
+
+        self.assertEqual(report.worst, 2.0)
+        self.assertAlmostEqual(report.p50, 1.25)
+
+    def test_percentiles_without_latencies(self):
+        report = TickReport(now=datetime(2021, 1, 1), budget=1.0)
+
+        self.assertTrue(np.isnan(report.p50))
+        self.assertTrue(np.isnan(report.worst))
+
+
+class RealtimeSchedulerTestCase(unittest.TestCase):
+    def test_all_agents_within_budget(self):
+        agents = [SleepingAgent(f"agent_{i}", 0.001) for i in range(8)]
+
+        with RealtimeScheduler(agents, budget=1.0, max_workers=4) as scheduler:
+            report = scheduler.tick(datetime(2021, 1, 1), 100, Interval.HOUR)
+
+        self.assertEqual(sorted(report.latencies), sorted(a.name for a in agents))
+        self.assertEqual(report.missed, [])
+        self.assertTrue(all(agent.updates for agent in agents))
+        self.assertLess(report.worst, 1.0)
+
+    def test_slow_agent_misses_deadline_and_is_skipped(self):
+        fast = SleepingAgent("fast", 0.001)
+        slow = SleepingAgent("slow", 0.3)
+
+        with RealtimeScheduler([fast, slow], budget=0.05, max_workers=2) as scheduler:
+            first = scheduler.tick(datetime(2021, 1, 1, 0), 100, Interval.HOUR)
+            self.assertEqual(list(first.latencies), ["fast"])
+            second = scheduler.tick(datetime(2021, 1, 1, 1), 100, Interval.HOUR)
+
+        self.assertEqual(first.missed, ["slow"])
+        self.assertEqual(list(first.latencies), ["fast"])
+        self.assertEqual(list(first.late_latencies), ["slow"])
+        self.assertGreaterEqual(first.worst, 0.3)
+        self.assertEqual(second.skipped, ["slow"])
+        self.assertEqual(scheduler.missed["slow"], 2)
+        self.assertEqual(len(fast.updates), 2)
+        self.assertEqual(len(slow.updates), 1)
+
+    def test_priority_orders_agents(self):
+        poor = SleepingAgent("poor", 0.05, capital=10)
+        rich = SleepingAgent("rich", 0.05, capital=1000)
+
+        with RealtimeScheduler([poor, rich], budget=0.08, max_workers=1) as scheduler:
+            report = scheduler.tick(datetime(2021, 1, 1), 100, Interval.HOUR)
+
+            self.assertEqual(list(report.latencies), ["rich"])
+            self.assertEqual(report.missed, ["poor"])
+
+    def test_fitness_priority(self):
+        poor = SleepingAgent("poor", 0.05, capital=10)
+        rich = SleepingAgent("rich", 0.05, capital=1000)
+
+        with RealtimeScheduler(
+            [poor, rich], budget=0.08, max_workers=1, priority="fitness"
+        ) as scheduler:
+            report = scheduler.tick(datetime(2021, 1, 1), 100, Interval.HOUR)
+
+            self.assertEqual(list(report.latencies), ["poor"])
+
+    def test_failed_update_keeps_late_agents_running(self):
+        failing = SleepingAgent("failing", 0.001)
+        failing.update = Mock(side_effect=ValueError("update failed"))
+        slow = SleepingAgent("slow", 0.3)
+
+        with RealtimeScheduler(
+            [failing, slow], budget=0.05, max_workers=2
+        ) as scheduler:
+            with self.assertRaises(ValueError):
+                scheduler.tick(datetime(2021, 1, 1, 0), 100, Interval.HOUR)
+            failing.update = Mock()
+            report = scheduler.tick(datetime(2021, 1, 1, 1), 100, Interval.HOUR)
+
+        self.assertEqual(report.skipped, ["slow"])
+        self.assertEqual(len(slow.updates), 1)
+
+    def test_late_failure_keeps_other_late_agents_tracked(self):
+        bad = FailingAgent("bad", 0.1, capital=1000)
+        slow = SleepingAgent("slow", 0.5, capital=10)
+
+        with RealtimeScheduler([bad, slow], budget=0.02, max_workers=2) as scheduler:
+            first = scheduler.tick(datetime(2021, 1, 1, 0), 100, Interval.HOUR)
+            time.sleep(0.15)
+            with self.assertRaises(ValueError):
+                scheduler.tick(datetime(2021, 1, 1, 1), 100, Interval.HOUR)
+            bad.update = Mock()
+            report = scheduler.tick(datetime(2021, 1, 1, 2), 100, Interval.HOUR)
+
+        self.assertEqual(first.missed, ["bad", "slow"])
+        self.assertEqual(report.skipped, ["slow"])
+        self.assertEqual(len(slow.updates), 1)
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            RealtimeScheduler([], budget=0)
@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from src.differential import random_ohlcv_frame
+from src.exchange import Interval, LocalBTCExchange
+from src.screening import MultiFidelityScreener, ScreeningReport
+from src.system import TradingSystem
+
+
+class ScreeningReportTestCase(unittest.TestCase):
+    def test_rank_correlation_of_identical_ranking(self):
+        report = ScreeningReport(
+            screening_fitness=[0.1, 0.5, 0.3, 0.9],
+            full_fitness={0: 1.0, 1: 3.0, 2: 2.0, 3: 4.0},
+        )
+
+        self.assertAlmostEqual(report.rank_correlation(), 1.0)
+
+    def test_rank_correlation_of_reversed_ranking(self):
+        report = ScreeningReport(
+            screening_fitness=[0.1, 0.5, 0.3],
+            full_fitness={0: 3.0, 1: 1.0, 2: 2.0},
+        )
+
+        self.assertAlmostEqual(report.rank_correlation(), -1.0)
+
+    def test_rank_correlation_needs_two_candidates(self):
+        report = ScreeningReport(screening_fitness=[0.1], full_fitness={0: 1.0})
+
+        self.assertTrue(np.isnan(report.rank_correlation()))
+
+
+class MultiFidelityScreenerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.exchange = LocalBTCExchange.from_frame(
+            random_ohlcv_frame(np.random.default_rng(0), 24 * 60)
+        )
+        self.system = TradingSystem(
+            exchange=self.exchange,
+            initial_population=8,
+            generation_lifespan=48,
+            interval=Interval.HOUR,
+        )
+
+    def test_promotes_top_fraction(self):
+        reports = []
+        screener = MultiFidelityScreener(
+            self.system,
+            self.exchange.resample(Interval.DAY),
+            screening_lifespan=20,
+            promote_fraction=0.25,
+            on_report=reports.append,
+        )
+        strategies = [agent.strategy for agent in self.system.agents]
+
+        report = screener.evaluate(datetime(2021, 1, 10))
+
+        self.assertEqual(reports, [report])
+        self.assertEqual(len(report.promoted), 2)
+        self.assertEqual(report.calibration, [])
+        self.assertEqual(sorted(report.full_fitness), sorted(report.promoted))
+        best = max(report.screening_fitness)
+        self.assertEqual(report.screening_fitness[report.promoted[0]], best)
+        self.assertEqual(
+            [agent.strategy for agent in self.system.agents],
+            [strategies[i] for i in report.promoted],
+        )
+        self.assertTrue(all(agent.decisions for agent in self.system.agents))
+
+    def test_calibration_evaluates_rejected_candidates(self):
+        screener = MultiFidelityScreener(
+            self.system,
+            self.exchange.subsample(24),
+            screening_interval=Interval.HOUR,
+            screening_lifespan=20,
+            promote_fraction=0.25,
+            calibration_fraction=1.0,
+        )
+
+        report = screener.evaluate(datetime(2021, 1, 10))
+
+        self.assertEqual(len(report.full_fitness), 8)
+        self.assertEqual(len(report.calibration), 6)
+        self.assertEqual(len(self.system.agents), 2)
+        self.assertFalse(np.isnan(report.rank_correlation()))
+
+    def test_screening_ticks_are_floored_to_the_coarse_candles(self):
+        screener = MultiFidelityScreener(
+            self.system, self.exchange.resample(Interval.DAY)
+        )
+
+        report = screener.evaluate(datetime(2021, 1, 10, 5))
+
+        self.assertEqual(len(report.screening_fitness), 8)
+
+    def test_default_lifespan_covers_the_full_evaluation(self):
+        screener = MultiFidelityScreener(
+            self.system, self.exchange.resample(Interval.DAY)
+        )
+
+        self.assertEqual(screener.screening_lifespan, 2)
+
+    def test_invalid_promote_fraction(self):
+        with self.assertRaises(ValueError):
+            MultiFidelityScreener(self.system, self.exchange, promote_fraction=0)
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.config import RunConfig
+from src.differential import random_ohlcv_frame
+from src.exchange import LocalBTCExchange
+from src.sweep import (
+    SharedMarketData,
+    SweepRunner,
+    grid_search,
+    random_search,
+    trial_id,
+)
+
+
+class SearchSpaceTestCase(unittest.TestCase):
+    def test_grid_search(self):
+        trials = grid_search({"mutation_rate": [0.1, 0.2], "generations": [1, 2, 3]})
+
+        self.assertEqual(len(trials), 6)
+        self.assertIn({"mutation_rate": 0.2, "generations": 3}, trials)
+
+    def test_random_search(self):
+        space = {
+            "mutation_rate": {"low": 0.01, "high": 0.1},
+            "generation_lifespan": {"low": 10, "high": 20},
+            "interval": ["hour", "day"],
+        }
+
+        trials = random_search(space, samples=20, seed=1)
+
+        self.assertEqual(trials, random_search(space, samples=20, seed=1))
+        for trial in trials:
+            self.assertTrue(0.01 <= trial["mutation_rate"] <= 0.1)
+            self.assertIsInstance(trial["generation_lifespan"], int)
+            self.assertIn(trial["interval"], ["hour", "day"])
+
+    def test_trial_id_ignores_key_order(self):
+        self.assertEqual(
+            trial_id({"a": 1, "b": 2}),
+            trial_id({"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(trial_id({"a": 1}), trial_id({"a": 2}))
+
+
+class SharedMarketDataTestCase(unittest.TestCase):
+    def test_attach_does_not_copy(self):
+        exchange = LocalBTCExchange.from_frame(
+            random_ohlcv_frame(np.random.default_rng(0), 24 * 20)
+        )
+        shared, block = SharedMarketData.create(exchange)
+        try:
+            attached, attached_block = shared.attach()
+
+            pd.testing.assert_frame_equal(
+                attached.market_data, exchange.market_data, check_like=True
+            )
+            self.assertTrue(
+                np.shares_memory(
+                    attached.market_data["Close"].to_numpy(),
+                    shared.arrays(attached_block)["Close"],
+                )
+            )
+            self.assertEqual(
+                attached.get_current_price("2021-01-02 00:00:00"),
+                exchange.get_current_price("2021-01-02 00:00:00"),
+            )
+
+            del attached
+            attached_block.close()
+        finally:
+            block.close()
+            block.unlink()
+
+
+class SweepRunnerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        data_path = os.path.join(self.directory.name, "data.csv")
+        random_ohlcv_frame(np.random.default_rng(0), 24 * 20).to_csv(
+            data_path, index=False
+        )
+        self.config = RunConfig(
+            data_path=data_path,
+            initial_population=4,
+            generation_lifespan=12,
+            generations=2,
+            start_time="2021-01-05 00:00:00",
+        )
+        self.output_path = os.path.join(self.directory.name, "sweep.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_runs_and_resumes(self):
+        trials = grid_search({"mutation_rate": [0.01, 0.1]})
+
+        results = SweepRunner(self.config, trials[:1], self.output_path, 2).run()
+
+        self.assertEqual(len(results), 1)
+
+        runner = SweepRunner(self.config, trials, self.output_path, 2)
+
+        self.assertEqual(runner.pending_trials(), trials[1:])
+
+        results = runner.run()
+
+        self.assertEqual(sorted(results["mutation_rate"]), [0.01, 0.1])
+        self.assertEqual(
+            set(results["trial_id"]), {trial_id(trial) for trial in trials}
+        )
+        self.assertTrue((results["best_fitness"] >= results["mean_fitness"]).all())
+
+    def test_failed_trial_keeps_finished_trials(self):
+        # the first trial starts after the end of the market data
+        trials = [
+            {"start_time": "2021-06-01 00:00:00"},
+            {"mutation_rate": 0.01},
+        ]
+        runner = SweepRunner(self.config, trials, self.output_path, 2)
+
+        with self.assertRaises(IndexError):
+            runner.run()
+
+        self.assertEqual(runner.pending_trials(), trials[:1])
+
+    def test_resume_with_a_new_swept_parameter(self):
+        SweepRunner(self.config, [{"mutation_rate": 0.01}], self.output_path).run()
+        trials = [
+            {"mutation_rate": 0.01},
+            {"generation_lifespan": 6, "mutation_rate": 0.2},
+            {"mutation_rate": 0.1},
+        ]
+        runner = SweepRunner(self.config, trials, self.output_path, 1)
+
+        results = runner.run()
+
+        self.assertEqual(runner.pending_trials(), [])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            results.set_index("trial_id")["generation_lifespan"].dropna().to_dict(),
+            {trial_id(trials[1]): 6},
+        )
+
+    def test_rejects_invalid_trials_before_running(self):
+        runner = SweepRunner(self.config, [{"interval": "week"}], self.output_path)
+
+        with self.assertRaises(ValueError):
+            runner.run()
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_rejects_swept_data_path(self):
+        with self.assertRaises(ValueError):
+            SweepRunner(self.config, [{"data_path": "other.csv"}], self.output_path)
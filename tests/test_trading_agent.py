@@ -103,6 +103,29 @@ class TradingAgentTradeTestCase(unittest.TestCase):
         )
         self.assertEqual(agent.capital, 799.8)
         self.assertEqual(agent.position, 0.0033333333333333335)
+        self.assertEqual(agent.long_trades, 2)
+        self.assertEqual(agent.short_trades, 0)
+
+    def test_short_signal_with_negative_confidence_counts_as_short(self):
+        exchange = MockExchange()
+        exchange.get_current_price.return_value = 60000
+        strategy = MockStrategy()
+        strategy.decide.return_value = "short", -1.0, {}
+
+        agent = TradingAgent(
+            name="test",
+            strategy=strategy,
+            exchange=exchange,
+            initial_capital=1000,
+            position_size_percent=0.1,
+            min_trade_size=1,
+            transaction_fee=0.001,
+        )
+        agent.update(now="2021-01-01 00:00:00", max_history_count=100, interval="hour")
+
+        self.assertEqual(agent.position, 0.0016666666666666668)
+        self.assertEqual(agent.long_trades, 0)
+        self.assertEqual(agent.short_trades, 1)
 
     def test_update_does_not_make_trade_for_small_trade_size(self):
         exchange = MockExchange()
@@ -248,3 +271,31 @@ class TradingAgentMaxDrawDownTestCase(unittest.TestCase):
         # After third drop: 10 shares * 80 = 800 (27.27% drawdown)
         # After recovery: 10 shares * 100 = 1000
         self.assertAlmostEqual(agent.calculate_max_drawdown(), 0.27, places=2)
+
+    def test_multiple_drawdowns_with_spilled_history(self):
+        """Test max drawdown when older decisions were spilled to disk"""
+        prices = [100.0, 90.0, 110.0, 85.0, 95.0, 80.0, 100.0]
+        signals = [("long", 1, {})] + [("hold", 0, {})] * 5 + [("short", 1, {})]
+
+        exchange = MockExchange()
+        exchange.get_market_data.return_value = self.create_price_data(prices)
+        strategy = MockStrategy()
+        agent = TradingAgent(
+            name="test_agent",
+            exchange=exchange,
+            strategy=strategy,
+            initial_capital=1000,
+            position_size_percent=1.0,
+            min_trade_size=1,
+            history_size=2,
+        )
+
+        for i in range(len(prices)):
+            current_time = self.base_date + timedelta(days=i)
+            strategy.decide.return_value = signals[i]
+            exchange.get_current_price.return_value = prices[i]
+            agent.update(current_time, 10, Interval.DAY)
+
+        self.assertEqual(len(agent.decisions), 7)
+        self.assertAlmostEqual(agent.calculate_max_drawdown(), 0.27, places=2)
+        self.assertAlmostEqual(agent.fitness(), 1.0 * (1 - 0.2727), places=3)